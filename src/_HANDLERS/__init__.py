@@ -4,7 +4,8 @@ DESCRIPTION = 'Handler methods for the Python-based analytics bot for the Deepwo
 license = 'MIT'
 
 from .commandManager import commandManager
-from .dataManager import fetch_table, searchTableByName, searchTableById
+from .dataManager import fetch_table, searchTableByName, searchTableById, get_table, get_table_index, table_version
+from .cacheManager import LRUCache
 from .spellCheckManager import find
 
 __all__ = [
@@ -12,5 +13,9 @@ __all__ = [
     'fetch_table',
     'searchTableByName',
     'searchTableById',
+    'get_table',
+    'get_table_index',
+    'table_version',
+    'LRUCache',
     'find'
 ]
\ No newline at end of file
@@ -0,0 +1,103 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and (optionally) entry age.
+
+    Entries older than `ttl` seconds are treated as misses and dropped on access.
+    With `maxbytes`, values must support len() (e.g. bytes) and the cache is also
+    kept under that many bytes in total; a single value larger than that is not stored.
+    Hit/miss/eviction counters are kept so callers can report cache efficiency.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, maxbytes=None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stored_at, value = entry
+            if self._expired(stored_at, now):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _size(self, value):
+        return len(value) if self.maxbytes is not None else 0
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._size(entry[1])
+        return entry
+
+    def set(self, key, value):
+        with self._lock:
+            self._remove(key)
+            size = self._size(value)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._data[key] = (time.monotonic(), value)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self._bytes > self.maxbytes):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._remove(key)
+        return entry[1] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[0], time.monotonic())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'bytes': self._bytes,
+                'maxbytes': self.maxbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
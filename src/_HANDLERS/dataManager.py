@@ -1,6 +1,8 @@
 import requests
 import dotenv
 import os
+import time
+import threading
 
 dotenv.load_dotenv()
 # Using variables from .env file (DATABASE_URL and DATABASE_KEY)
@@ -15,19 +17,96 @@ HEADERS = {
     'Prefer': 'return=representation'
 }
 
+def _request_table(table_name):
+    response = requests.get(
+        f'{SUPABASE_URL}/rest/v1/{table_name}?select=*',
+        headers=HEADERS,
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json()
+
 def fetch_table(table_name):
     try:
-        response = requests.get(
-            f'{SUPABASE_URL}/rest/v1/{table_name}?select=*',
-            headers=HEADERS,
-            timeout=10
-        )
-        response.raise_for_status()
-        return response.json()
+        return _request_table(table_name)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching table {table_name}: {e}")
         return []
 
+# Table snapshots shared by the analytics code. A snapshot is a list that is never
+# mutated; refreshing swaps in a new list, so derived indexes can compare by identity.
+TABLE_CACHE_TTL = float(os.getenv("TABLE_CACHE_TTL", "3600"))
+TABLE_RETRY_DELAY = 60
+_snapshots = {}     # table_name -> (fetched_at, rows, version)
+_indexes = {}       # (table_name, builder) -> (rows, index)
+_refreshing = set()
+_snapshot_lock = threading.Lock()
+
+def _load_snapshot(table_name):
+    try:
+        rows = _request_table(table_name)
+        fetched_at = time.monotonic()
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching table {table_name}: {e}")
+        previous = _snapshots.get(table_name)
+        if previous is not None:
+            # keep serving the last good snapshot, try again later
+            rows = previous[1]
+        else:
+            rows = []
+        fetched_at = time.monotonic() - TABLE_CACHE_TTL + TABLE_RETRY_DELAY
+    with _snapshot_lock:
+        previous = _snapshots.get(table_name)
+        if previous is None:
+            version = 1
+        elif rows is previous[1]:
+            version = previous[2]
+        else:
+            version = previous[2] + 1
+        _snapshots[table_name] = (fetched_at, rows, version)
+        _refreshing.discard(table_name)
+    return rows
+
+def _refresh_in_background(table_name):
+    with _snapshot_lock:
+        if table_name in _refreshing:
+            return
+        _refreshing.add(table_name)
+    threading.Thread(target=_load_snapshot, args=(table_name,), daemon=True).start()
+
+def get_table(table_name):
+    """
+    Cached fetch_table(). Only the very first call for a table blocks on the network;
+    once a snapshot exists, stale snapshots keep being served while a background
+    thread refreshes them.
+    """
+    snapshot = _snapshots.get(table_name)
+    if snapshot is None:
+        return _load_snapshot(table_name)
+    fetched_at, rows, _ = snapshot
+    if time.monotonic() - fetched_at > TABLE_CACHE_TTL:
+        _refresh_in_background(table_name)
+    return rows
+
+def refresh_table(table_name):
+    """Synchronously reload a table snapshot, invalidating indexes derived from it."""
+    return _load_snapshot(table_name)
+
+def table_version(table_name):
+    """Increments each time a table snapshot is replaced; 0 if never loaded."""
+    snapshot = _snapshots.get(table_name)
+    return snapshot[2] if snapshot else 0
+
+def get_table_index(table_name, builder):
+    """Return builder(rows) for the current snapshot, rebuilt only when the snapshot changes."""
+    rows = get_table(table_name)
+    cached = _indexes.get((table_name, builder))
+    if cached is not None and cached[0] is rows:
+        return cached[1]
+    index = builder(rows)
+    _indexes[(table_name, builder)] = (rows, index)
+    return index
+
 #fetching functions
 def searchTableByName(table_name, item_name, key_name = "name"):
     table_data = fetch_table(table_name)
@@ -15,6 +15,9 @@ class interactionManager:
         parts = reply.split()
         command = parts[0].lower() if parts else ""
         args = parts[1:]
+        # "<command> refresh" bypasses the build cache (e.g. after editing the build)
+        force_refresh = any(arg.lower() == 'refresh' for arg in args)
+        args = [arg for arg in args if arg.lower() != 'refresh']
         command_file = os.path.join(self.COMMANDPATH, f"{command}.py")
 
         # Get guild_id for language support
@@ -25,7 +28,7 @@ class interactionManager:
         try:
             link = replied_msg.content.split('https://deepwoken.co/builder?id=')[1].split()[0]
             build_id = link.split('&')[0]
-            build = dwb.dwbBuild(build_id)
+            build = dwb.get_build(build_id, force_refresh=force_refresh)
         except Exception as e:
             print(f"Error extracting build id: {e}")
             return (None, None)
@@ -40,6 +43,9 @@ class interactionManager:
                 if command == 'ehp' and len(args) >= 1:
                     kit_id = args[0]
                     result = command_module.execute(build, guild_id, kit_id=kit_id)
+                # shrineplan takes its post-shrine targets from the rest of the reply
+                elif command == 'shrineplan' and args:
+                    result = command_module.execute(build, guild_id, targets=' '.join(args))
                 else:
                     result = command_module.execute(build, guild_id)
                 # If the result is already a tuple, return as is; else wrap in (result, None)
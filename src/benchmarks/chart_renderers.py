@@ -0,0 +1,101 @@
+"""
+Compare the matplotlib and Pillow chart renderers.
+
+Each (chart, backend) pair runs in a fresh interpreter so import cost and peak
+RSS are measured in isolation. Run from src/:
+
+    python -m benchmarks.chart_renderers [-n RUNS]
+"""
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import importlib
+
+# Representative jobs, as produced by statevo_job()/breakdown_job()
+SAMPLE_JOBS = {
+    'statevo': {
+        "categories": ["Strength", "Fortitude", "Agility", "Willpower", "Charisma", "Heavy Wep.", "Flamecharm"],
+        "highlight": [False, True, False, False, False, True, True],
+        "splits": [5, 6],
+        "pre": [53, 60, 30, 25, 2, 90, 40],
+        "ord": [46, 46, 46, 46, 2, 65, 46],
+        "post": [75, 80, 40, 30, 25, 90, 40],
+        "labels": {
+            "stat_value": "Stat Value", "pre_shrine": "Pre-Shrine", "order": "Order", "post_shrine": "Post-Shrine",
+            "reinvest_interval": "Reinvest interval", "reinvest_key_stat": "Reinvest (Key Stat)",
+        },
+    },
+    'breakdown': {
+        "panels": [
+            [["Trait", "Power", "Base HP", "Fortitude", "Fortitude health talents", "+HP Talents", "Total"],
+             [30, 80, 200, 32.5, 5, 10, 357.5],
+             [44.3, 118.0, 295.1, 48.0, 7.4, 14.8, 527.5], 693],
+            [["Trait", "Power", "Base HP", "Fortitude", "Fortitude health talents", "+HP Talents", "Total"],
+             [30, 80, 200, 32.5, 5, 10, 357.5],
+             [37.1, 98.9, 247.1, 40.2, 6.2, 12.4, 441.7], 632],
+        ],
+    },
+}
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(kind, backend, runs):
+    """Measure one renderer in this process and return the numbers as a dict."""
+    from plugins.renderService import RENDERERS
+
+    module_name, func_name = RENDERERS[kind][backend]
+    job = SAMPLE_JOBS[kind]
+
+    start = time.perf_counter()
+    render = getattr(importlib.import_module(module_name), func_name)
+    render(job)
+    cold = time.perf_counter() - start
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        size = len(render(job))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        'kind': kind,
+        'backend': backend,
+        'cold_ms': cold * 1000,
+        'median_ms': times[len(times) // 2] * 1000,
+        'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        'bytes': size,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--runs', type=int, default=20)
+    parser.add_argument('--child', nargs=2, metavar=('KIND', 'BACKEND'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_one(*args.child, args.runs)))
+        return
+
+    print(f"{'chart':<10} {'backend':<11} {'cold ms':>8} {'median':>8} {'p95':>8} {'KiB':>7} {'RSS MB':>7}")
+    for kind in SAMPLE_JOBS:
+        for backend in ('matplotlib', 'pillow'):
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.chart_renderers', '-n', str(args.runs), '--child', kind, backend],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{kind:<10} {backend:<11} {r['cold_ms']:>8.0f} {r['median_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                  f"{r['bytes'] / 1024:>7.0f} {r['peak_rss_mb']:>7.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Check plugins.SoO.order against the original pass-by-pass implementation, and
+SoO.order_batch against order, then time all three. Results must be identical
+(same dict, same PointsSpent / same matrix) on every build of a random corpus
+covering every race. The same checks run on a smaller corpus in
+tests/test_shrine_order.py. Run from src/:
+
+    python -m benchmarks.shrine_order [-n BUILDS] [--seed SEED]
+"""
+import random
+import argparse
+import time
+
+from plugins import SoO
+from plugins.SoO import racial_stats, attunements, merge_stats, MAXIMUM_REDUCTION
+from plugins.SoO import order_batch, stats_matrix, race_indices, STAT_COLUMNS
+
+BASE = ["Strength", "Fortitude", "Agility", "Intelligence", "Willpower", "Charisma"]
+WEAPONS = ["Heavy Wep.", "Medium Wep.", "Light Wep."]
+
+
+def legacy_order(stats, player_stats):
+    """SoO.order as it was before the water-filling rewrite, kept verbatim for comparison."""
+    if 'base' in stats:
+        stats = merge_stats(stats['weapon'], stats['attunement'],stats['base'])
+
+    for stat_name, value in stats.items():
+        if stat_name in racial_stats[player_stats["Race"]]:
+            value -= racial_stats[player_stats["Race"]][stat_name]
+        player_stats["PointsSpent"] += value
+
+    points_start = player_stats["PointsSpent"]
+    preshrine_build = stats.copy()
+
+    affected_stats = []
+    for stat_name, stat_value in stats.items():
+        if stat_value > 0:
+            if stat_name in racial_stats[player_stats["Race"]]:
+                if racial_stats[player_stats["Race"]][stat_name] > 0:
+                    if stat_value - racial_stats[player_stats["Race"]][stat_name] == 0:
+                        continue
+            affected_stats.append(stat_name)
+    for stat_name in stats.keys():
+        if stat_name in affected_stats:
+            stats[stat_name] = points_start / len(affected_stats)
+
+    bottlenecked = []
+    bottlenecked_divide_by = len(affected_stats)
+    previous_stats = stats.copy()
+
+    while True:
+        bottlenecked_points = 0
+        bottlenecked_stats = False
+
+        for stat_name, stat_value in stats.items():
+            if stat_name not in attunements and stat_name in affected_stats:
+                shrine_stat = preshrine_build[stat_name]
+
+                if shrine_stat - stat_value > MAXIMUM_REDUCTION:
+                    stats[stat_name] = shrine_stat - MAXIMUM_REDUCTION
+                    bottlenecked_points += stats[stat_name] - previous_stats[stat_name]
+                    bottlenecked.append(stat_name)
+                    bottlenecked_divide_by -= 1
+
+        for stat_name, stat_value in stats.items():
+            if stat_name in affected_stats and stat_name not in bottlenecked:
+                stats[stat_name] -= bottlenecked_points / bottlenecked_divide_by
+
+                if stat_name not in attunements:
+                    if preshrine_build[stat_name] - stats[stat_name] > 25:
+                        bottlenecked_stats = True
+
+        previous_stats = stats.copy()
+
+        if not bottlenecked_stats:
+            break
+
+    for stat_name in stats.keys():
+        stats[stat_name] = int(stats[stat_name])
+
+    points_spent_after_shrine = 0
+    for stat_name, value in stats.items():
+        if stat_name in racial_stats[player_stats["Race"]]:
+            value -= racial_stats[player_stats["Race"]][stat_name]
+        points_spent_after_shrine += value
+
+    spare_points = points_start - points_spent_after_shrine
+
+    if spare_points > len(affected_stats):
+        for stat_name in affected_stats:
+            stats[stat_name] += 1
+
+    return stats
+
+
+def random_build(rng):
+    """A flat pre-shrine stat dict in the same key order dwbBuild.flatpre uses."""
+    race = rng.choice(list(racial_stats))
+    racial = racial_stats[race]
+    stats = {}
+    for name in BASE:
+        stats[name] = racial.get(name, 0) + (rng.choice([0, 0, rng.randint(1, 100)]))
+    for name in WEAPONS:
+        stats[name] = rng.choice([0, 0, rng.randint(1, 100)])
+    for name in attunements:
+        stats[name] = rng.choice([0, 0, 0, rng.randint(1, 100)])
+    return race, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--builds', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [random_build(rng) for _ in range(args.builds)]
+
+    for race, stats in corpus:
+        old_player, new_player = {"Race": race, "PointsSpent": 0}, {"Race": race, "PointsSpent": 0}
+        old = legacy_order(stats.copy(), old_player)
+        new = SoO.order(stats.copy(), new_player)
+        if old != new or old_player != new_player or [type(v) for v in old.values()] != [type(v) for v in new.values()]:
+            raise SystemExit(f"Mismatch for {race} {stats}:\n  legacy {old}\n  new    {new}")
+    print(f"order identical to legacy on {len(corpus)} builds")
+
+    matrix = stats_matrix(stats for _, stats in corpus)
+    races = race_indices(race for race, _ in corpus)
+    batch = order_batch(matrix, races)
+    for row, (race, stats) in zip(batch, corpus):
+        expected = SoO.order(stats.copy(), {"Race": race, "PointsSpent": 0})
+        if row.tolist() != [expected[stat] for stat in STAT_COLUMNS]:
+            raise SystemExit(f"Batch mismatch for {race} {stats}:\n  order {expected}\n  batch {row.tolist()}")
+    print(f"order_batch identical to order on {len(corpus)} builds")
+
+    for name, func in (('legacy', legacy_order), ('order', SoO.order)):
+        start = time.perf_counter()
+        for race, stats in corpus:
+            func(stats.copy(), {"Race": race, "PointsSpent": 0})
+        elapsed = time.perf_counter() - start
+        print(f"{name:<7} {elapsed * 1e6 / len(corpus):8.1f} us/build")
+    start = time.perf_counter()
+    order_batch(matrix, races)
+    elapsed = time.perf_counter() - start
+    print(f"{'batch':<7} {elapsed * 1e6 / len(corpus):8.1f} us/build")
+
+
+if __name__ == '__main__':
+    main()
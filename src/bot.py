@@ -12,6 +12,11 @@ from http.server import BaseHTTPRequestHandler, HTTPServer
 from dotenv import load_dotenv
 from discord import app_commands
 
+load_dotenv()
+
+# Sets MPLCONFIGDIR from FONT_CACHE_DIR; must come before anything imports matplotlib
+import utils.font_manager  # noqa: F401
+
 from _HANDLERS.commandManager import commandManager
 from _HANDLERS.interactionManager import interactionManager
 from _HANDLERS.clopenManager import channelManager
@@ -32,8 +37,12 @@ from interactions import validate as validate_interaction
 
 import plugins._DWBAPIWRAPPER as dwb
 from _HANDLERS.dataManager import searchTableByName
+from plugins.renderService import render_service
+from plugins.legalityChecker import legality_checker
 
-load_dotenv()
+# Fork the chart render workers before any other thread exists
+render_service.start()
+legality_checker.start_watching()
 
 _HEALTH_SERVER_STARTED = False
 
@@ -112,7 +121,14 @@ intents.message_content = True
 intents.guilds = True
 intents.reactions = True
 
-client = discord.Client(intents=intents)
+class BotClient(discord.Client):
+    async def close(self):
+        # Close the pooled builder API session while the event loop is still running
+        await super().close()
+        await dwb.close_session()
+
+
+client = BotClient(intents=intents)
 tree = app_commands.CommandTree(client)
 _slash_synced = False
 
@@ -247,6 +263,14 @@ async def ehp_slash_command(interaction: discord.Interaction, kit_id: Optional[s
     await execute(interaction, kit_id, build_link)
 
 
+@tree.command(name="ehpcurve", description="Plot Effective Health Points against enemy penetration for a Deepwoken build.")
+@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+@app_commands.describe(build_link="Optional: Deepwoken builder link (or reply to a message with a build link)")
+async def ehpcurve_slash_command(interaction: discord.Interaction, build_link: Optional[str] = None):
+    from slash_commands.ehpcurve import execute
+    await execute(interaction, build_link)
+
+
 @tree.command(name="stats", description="Display stat evolution diagram for a Deepwoken build.")
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 @app_commands.describe(build_link="Optional: Deepwoken builder link (or reply to a message with a build link)")
@@ -255,13 +279,70 @@ async def stats_slash_command(interaction: discord.Interaction, build_link: Opti
     await execute(interaction, build_link)
 
 
-@tree.command(name="validate", description="Validate a Deepwoken build against the Deepleague rulebook.")
+@tree.command(name="shrine", description="Try moving points between stats and see how the Shrine of Order changes.")
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 @app_commands.describe(build_link="Optional: Deepwoken builder link (or reply to a message with a build link)")
-async def validate_slash_command(interaction: discord.Interaction, build_link: Optional[str] = None):
-    from slash_commands.validate import execute
+async def shrine_slash_command(interaction: discord.Interaction, build_link: Optional[str] = None):
+    from slash_commands.shrine import execute
+    await execute(interaction, build_link)
+
+
+@tree.command(name="shrineplan", description="Find pre-shrine allocations that keep given stats after the Shrine of Order.")
+@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+@app_commands.describe(
+    targets="Post-shrine minimums, e.g. \"Fortitude 40, Heavy 60\"",
+    budget="Optional: pre-shrine points to spend (defaults to the build's pre-shrine points)",
+    build_link="Optional: Deepwoken builder link (or reply to a message with a build link)"
+)
+async def shrineplan_slash_command(interaction: discord.Interaction, targets: Optional[str] = None,
+                                   budget: Optional[app_commands.Range[int, 1, 1000]] = None, build_link: Optional[str] = None):
+    from slash_commands.shrineplan import execute
+    await execute(interaction, targets, budget, build_link)
+
+
+@tree.command(name="unlock", description="List the talents, weapons and mantras a build's final stats qualify for.")
+@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+@app_commands.describe(build_link="Optional: Deepwoken builder link (or reply to a message with a build link)")
+async def unlock_slash_command(interaction: discord.Interaction, build_link: Optional[str] = None):
+    from slash_commands.unlock import execute
     await execute(interaction, build_link)
 
+
+validate_mode_choices = [
+    app_commands.Choice(name="Wars", value="wars"),
+    app_commands.Choice(name="Depths", value="depths"),
+    app_commands.Choice(name="Glads", value="glads"),
+    app_commands.Choice(name="All modes", value="all"),
+]
+
+
+@tree.command(name="validate", description="Validate a Deepwoken build against the Deepleague rulebook.")
+@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+@app_commands.describe(
+    build_link="Optional: Deepwoken builder link (or reply to a message with a build link)",
+    mode="Optional: ruleset to check against (default Wars)"
+)
+@app_commands.choices(mode=validate_mode_choices)
+async def validate_slash_command(interaction: discord.Interaction, build_link: Optional[str] = None,
+                                 mode: Optional[app_commands.Choice[str]] = None):
+    from slash_commands.validate import execute
+    await execute(interaction, build_link, mode.value if mode else None)
+
+
+@tree.command(name="validate_roster", description="Validate a whole roster of Deepwoken builds against the Deepleague rulebook.")
+@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
+@app_commands.describe(
+    roster="Optional: text file with one Deepwoken builder link per line",
+    links="Optional: builder links pasted directly, separated by spaces",
+    mode="Optional: ruleset to check against (default Wars)"
+)
+@app_commands.choices(mode=validate_mode_choices)
+async def validate_roster_slash_command(interaction: discord.Interaction, roster: Optional[discord.Attachment] = None,
+                                        links: Optional[str] = None, mode: Optional[app_commands.Choice[str]] = None):
+    from slash_commands.validate_roster import execute
+    await execute(interaction, roster, links, mode.value if mode else None)
+
+
 # Try to pre-load commands at startup, but don't crash the bot if it fails
 try:
     cmd_manager.loadCommands()
@@ -0,0 +1,59 @@
+import discord
+import plugins._DWBAPIWRAPPER as dwb
+from plugins.ehpEngine import ehp_cache_stats
+from plugins.chartCache import chart_cache
+
+
+def execute(command_body, message):
+    if not message.guild:
+        return (discord.Embed(
+            description="This command can only be used in servers.",
+            color=0xED4245
+        ), None)
+
+    if not message.author.guild_permissions.administrator:
+        return (discord.Embed(
+            description="Only administrators can view or clear the bot caches.",
+            color=0xED4245
+        ), None)
+
+    parts = command_body.strip().split()
+
+    if len(parts) == 0 or parts[0].lower() == "stats":
+        return (_stats(), None)
+    if parts[0].lower() == "forget":
+        return (_forget(parts[1:]), None)
+    return (discord.Embed(
+        description=f"Unknown subcommand: `{parts[0]}`\nUsage: `.cache [stats]` or `.cache forget <build_link>`",
+        color=0xED4245
+    ), None)
+
+
+def _describe(stats):
+    return (
+        f"Hit rate: **{stats['hit_rate']:.0%}** ({stats['hits']} hits, {stats['misses']} misses)\n"
+        f"Entries: {stats['size']}/{stats['maxsize']} · Evictions: {stats['evictions']} · Expired: {stats['expirations']}"
+    )
+
+
+def _stats():
+    embed = discord.Embed(title="Cache Status", color=discord.Color.blurple())
+    embed.add_field(name="Builds", value=_describe(dwb.build_cache_stats()), inline=False)
+    embed.add_field(name="EHP Results", value=_describe(ehp_cache_stats()), inline=False)
+    charts = chart_cache.stats()
+    embed.add_field(name="Charts", value=_describe(charts) + f" · Disk hits: {charts['disk_hits']}", inline=False)
+    return embed
+
+
+def _forget(args):
+    if not args:
+        return discord.Embed(
+            description="Usage: `.cache forget <build_link or build_id>`",
+            color=0xED4245
+        )
+    build_id = args[0].split('builder?id=')[-1].split('&')[0]
+    dwb.invalidate_build(build_id)
+    return discord.Embed(
+        description=f"Build `{build_id}` will be fetched again the next time it is used.",
+        color=discord.Color.blurple()
+    )
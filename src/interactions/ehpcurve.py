@@ -0,0 +1,16 @@
+import discord
+from plugins.ehpCurve import plot_ehp_curve
+from plugins.imageEncoder import chart_filename
+from utils.language_manager import language_manager
+
+def execute(build, guild_id=None):
+    buf = plot_ehp_curve(build, guild_id)
+    file = discord.File(fp=buf, filename=chart_filename("ehp_curve"))
+
+    title = language_manager.get_text(guild_id, 'ehp_curve_title').format(name=build.name)
+    embed = discord.Embed(
+        title=title,
+        color=discord.Color.blurple()
+    )
+    embed.set_image(url=f"attachment://{file.filename}")
+    return embed, file
@@ -0,0 +1,31 @@
+from plugins.statEvo import statevograph
+from plugins.imageEncoder import chart_filename
+from plugins.requirementIndex import shrine_talent_changes
+from interactions.stats import add_talent_changes
+from plugins.SoO import ShrineState
+import discord
+from utils.language_manager import language_manager
+
+def execute(build, guild_id=None, state=None):
+    # A plain "shrine" reply has no what-if edits: show the build's own shrine
+    if state is None:
+        state = ShrineState(build.flatpre, build.race)
+    buf = statevograph(build, guild_id, state)
+    file = discord.File(buf, filename=chart_filename("shrine_plot"))
+
+    changes = state.changes()
+    if changes:
+        lines = [f"**{stat}** {delta:+d} ({state.original[stat]} → {state.stats[stat]})" for stat, delta in changes.items()]
+        description = f"**{language_manager.get_text(guild_id, 'shrine_changes')}**\n" + "\n".join(lines)
+    else:
+        description = language_manager.get_text(guild_id, 'shrine_no_changes')
+
+    embed = discord.Embed(
+        title = language_manager.get_text(guild_id, 'shrine_title'),
+        description=description,
+        color=discord.Color.blurple()
+    )
+    add_talent_changes(embed, *shrine_talent_changes(build, state.result(), state.stats), guild_id)
+    embed.set_footer(text=language_manager.get_text(guild_id, 'shrine_instructions'))
+    embed.set_image(url=f"attachment://{file.filename}")
+    return embed, file
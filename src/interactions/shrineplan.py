@@ -0,0 +1,44 @@
+from plugins.SoO import racial_stats
+from plugins.shrinePlanner import plan_shrine, parse_targets
+import discord
+from utils.language_manager import language_manager
+
+# Plans shown in the embed
+SHOWN_PLANS = 3
+
+def execute(build, guild_id=None, targets=None, budget=None):
+    # Replies pass the text after the command, e.g. "shrineplan fort 40, heavy 60"
+    if isinstance(targets, str):
+        try:
+            targets = parse_targets(targets)
+        except ValueError as exc:
+            return discord.Embed(title="Invalid Targets", description=str(exc), color=0xED4245)
+    targets = targets or {}
+    flatpre = build.flatpre
+    racial = racial_stats[build.race]
+    if budget is None:
+        budget = sum(value - racial.get(stat, 0) for stat, value in flatpre.items())
+
+    plans = plan_shrine(build.race, budget, targets, caps=build.flatpost, stats=list(flatpre))
+
+    wanted = ", ".join(f"{stat} {value}" for stat, value in targets.items()) or "-"
+    embed = discord.Embed(
+        title = language_manager.get_text(guild_id, 'shrineplan_title'),
+        description=language_manager.get_text(guild_id, 'shrineplan_summary').format(budget=budget, targets=wanted),
+        color=discord.Color.blurple()
+    )
+    if not plans:
+        embed.color = 0xED4245
+        embed.description += "\n\n" + language_manager.get_text(guild_id, 'shrineplan_none')
+        return embed
+
+    for i, plan in enumerate(plans[:SHOWN_PLANS], 1):
+        lines = [
+            f"{stat:<13}{plan.pre[stat]:>4} → {plan.post[stat]:>3}"
+            for stat in flatpre if plan.pre[stat] != racial.get(stat, 0)
+        ]
+        name = language_manager.get_text(guild_id, 'shrineplan_plan').format(
+            n=i, kept=plan.kept, spent=plan.spent
+        )
+        embed.add_field(name=name, value="```\n" + "\n".join(lines) + "\n```", inline=True)
+    return embed
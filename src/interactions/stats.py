@@ -1,15 +1,29 @@
 from plugins.statEvo import statevograph
+from plugins.imageEncoder import chart_filename
+from plugins.requirementIndex import shrine_talent_changes
 import discord
 from utils.language_manager import language_manager
 
 def execute(build, guild_id=None):
     buf = statevograph(build, guild_id)
-    file = discord.File(buf, filename="evo_plot.png")
+    file = discord.File(buf, filename=chart_filename("evo_plot"))
     
     title = language_manager.get_text(guild_id, 'stat_evolution_title')
     embed = discord.Embed(
         title = title,
         color=discord.Color.blurple()
     )
-    embed.set_image(url="attachment://evo_plot.png")
-    return embed, file
\ No newline at end of file
+    add_talent_changes(embed, *shrine_talent_changes(build), guild_id)
+    embed.set_image(url=f"attachment://{file.filename}")
+    return embed, file
+
+
+def add_talent_changes(embed, lost, gained, guild_id=None):
+    """Fields listing the talents whose requirements break or open up at the shrine."""
+    for key, names in (('talents_lost_after_shrine', lost), ('talents_gained_after_shrine', gained)):
+        if not names:
+            continue
+        value = ", ".join(names)
+        if len(value) > 1024:
+            value = value[:1020].rsplit(", ", 1)[0] + ", …"
+        embed.add_field(name=language_manager.get_text(guild_id, key), value=value, inline=False)
\ No newline at end of file
@@ -0,0 +1,48 @@
+import io
+import discord
+from plugins.requirementIndex import unlocks
+from utils.language_manager import language_manager
+
+# Names listed per table in the embed; the attached file has all of them
+SHOWN_QUALIFIED = 12
+SHOWN_NEAR = 8
+
+def _join(names, limit=1024):
+    value = ", ".join(names)
+    if len(value) > limit:
+        value = value[:limit - 4].rsplit(", ", 1)[0] + ", …"
+    return value
+
+def execute(build, guild_id=None):
+    stats = build.flatpost
+    results = unlocks(stats, near=SHOWN_NEAR)
+
+    embed = discord.Embed(
+        title = language_manager.get_text(guild_id, 'unlock_title'),
+        description=language_manager.get_text(guild_id, 'unlock_description'),
+        color=discord.Color.blurple()
+    )
+    lines = []
+    for table, (qualified, near_misses) in results.items():
+        label = language_manager.get_text(guild_id, f'unlock_{table}')
+        if qualified:
+            embed.add_field(
+                name=f"{label} ({len(qualified)})",
+                value=_join(qualified[:SHOWN_QUALIFIED]) + (", …" if len(qualified) > SHOWN_QUALIFIED else ""),
+                inline=False,
+            )
+        if near_misses:
+            embed.add_field(
+                name=language_manager.get_text(guild_id, 'unlock_near').format(kind=label),
+                value=_join(
+                    f"{name} (" + ", ".join(f"+{points} {stat}" for stat, points in short.items()) + ")"
+                    for name, short in near_misses
+                ),
+                inline=False,
+            )
+        lines.append(f"[{table}]")
+        lines += qualified
+        lines.append("")
+
+    file = discord.File(io.BytesIO("\n".join(lines).encode('utf-8')), filename="unlocks.txt")
+    return embed, file
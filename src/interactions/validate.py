@@ -1,7 +1,6 @@
-from plugins.legalityChecker import BuildLegalityChecker
+from plugins.legalityChecker import legality_checker
 
-def execute(build, _guild_id=None):
-    checker = BuildLegalityChecker()
-    result = checker.check_build(build)
-    embed = checker.report_embed(result)
+def execute(build, _guild_id=None, modes=None):
+    result = legality_checker.check_build(build, modes)
+    embed = legality_checker.report_embed(result)
     return embed
@@ -1,6 +1,8 @@
 from collections import defaultdict
+import bisect
 import json
 import os
+import numpy as np
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.join(current_dir, '..', '..')
@@ -25,73 +27,82 @@ def merge_stats(*dict_args):
 MAXIMUM_REDUCTION = 25
 
 def order(stats, player_stats):
+    """
+    Shrine of Order: spread the points spent evenly over every invested stat,
+    but never take more than MAXIMUM_REDUCTION from a non-attunement stat; the
+    points such a stat keeps are taken evenly from the rest.
+
+    All stats that are not capped move together, so they are tracked as a single
+    `level`. Stats get capped in order of their pre-shrine value, so one pass over
+    them sorted high to low finds every bottleneck. The float operations match
+    the original pass-by-pass redistribution exactly (same values, same order).
+    Adds this build's points to player_stats["PointsSpent"].
+    """
     # Calculate the points spent so far in the build, excluding racial stats
 
     if 'base' in stats:
-        stats = merge_stats(stats['weapon'], stats['attunement'],stats['base'])    
+        stats = merge_stats(stats['weapon'], stats['attunement'],stats['base'])
 
+    racial = racial_stats[player_stats["Race"]]
     for stat_name, value in stats.items():
-        if stat_name in racial_stats[player_stats["Race"]]:
-            value -= racial_stats[player_stats["Race"]][stat_name]
+        if stat_name in racial:
+            value -= racial[stat_name]
         player_stats["PointsSpent"] += value
 
     # Save the points spent so far as point_start
     points_start = player_stats["PointsSpent"]
-    
-    # Create a shallow copy of the current stats as pre-shrine
-    preshrine_build = stats.copy()
-    
-    # Identify which stats are invested for the shrine
-    affected_stats = []
-    for stat_name, stat_value in stats.items():
-        if stat_value > 0:
-            if stat_name in racial_stats[player_stats["Race"]]:
-                if racial_stats[player_stats["Race"]][stat_name] > 0:
-                    if stat_value - racial_stats[player_stats["Race"]][stat_name] == 0:
-                        continue  # Skip if stat - racialStat equals to 0 (not invested)
-            affected_stats.append(stat_name)
-                # Initial division of points to every affected stat
-    for stat_name in stats.keys():
-        if stat_name in affected_stats:
-            stats[stat_name] = points_start / len(affected_stats)
-
-    # Prepare for the bottlenecking step
-    bottlenecked = []
-    bottlenecked_divide_by = len(affected_stats)
-    previous_stats = stats.copy()
-
-    while True:
-        bottlenecked_points = 0
-        bottlenecked_stats = False
-
-        for stat_name, stat_value in stats.items():
-            # Only bottleneck non-attunement affected stats
-            if stat_name not in attunements and stat_name in affected_stats:
-                shrine_stat = preshrine_build[stat_name]
-
-                if shrine_stat - stat_value > MAXIMUM_REDUCTION:
-                    # Set the stat to preshrine value - MAXIMUM_REDUCTION
-                    stats[stat_name] = shrine_stat - MAXIMUM_REDUCTION
-                    # Add the difference to bottlenecked points
-                    bottlenecked_points += stats[stat_name] - previous_stats[stat_name]
-                    bottlenecked.append(stat_name)
-                    bottlenecked_divide_by -= 1  # Reduce the division counter
-
-        # Averaging out bottlenecked points
-        for stat_name, stat_value in stats.items():
-            if stat_name in affected_stats and stat_name not in bottlenecked:
-                stats[stat_name] -= bottlenecked_points / bottlenecked_divide_by
-                
-                # Check if any stat reduction is still larger than 25
-                if stat_name not in attunements:
-                    if preshrine_build[stat_name] - stats[stat_name] > 25:
-                        bottlenecked_stats = True
-
-        previous_stats = stats.copy()
-        
-        # Exit loop if no bottlenecked stats
-        if not bottlenecked_stats:
-            break
+
+    affected_stats = _affected(stats, racial)
+    candidates = sorted((s for s in affected_stats if s not in attunements), key=stats.__getitem__, reverse=True)
+    position = {stat_name: i for i, stat_name in enumerate(stats)}
+    return _distribute(stats, racial, points_start, affected_stats, candidates, position)
+
+
+def _is_affected(stat_name, stat_value, racial):
+    # Invested stats; a stat that only holds its racial points is not invested
+    return stat_value > 0 and not (racial.get(stat_name, 0) > 0 and stat_value - racial[stat_name] == 0)
+
+
+def _affected(stats, racial):
+    """Identify which stats are invested for the shrine."""
+    return [stat_name for stat_name, stat_value in stats.items() if _is_affected(stat_name, stat_value, racial)]
+
+
+def _distribute(stats, racial, points_start, affected_stats, candidates, position):
+    """
+    The shrine itself: rewrite `stats` in place and return it. `candidates` are the
+    affected non-attunement stats sorted by pre-shrine value, highest first, and
+    `position` maps every stat to its index in the stats dict.
+    """
+    if affected_stats:
+        # Initial division of points to every affected stat
+        level = points_start / len(affected_stats)
+        divide_by = len(affected_stats)
+        capped = 0
+
+        while True:
+            # Every stat still losing more than the cap is bottlenecked in this pass;
+            # the points it keeps are summed in dict order, like the original loop did
+            end = capped
+            while end < len(candidates) and stats[candidates[end]] - level > MAXIMUM_REDUCTION:
+                end += 1
+            bottlenecked_points = 0
+            for stat_name in sorted(candidates[capped:end], key=position.__getitem__):
+                bottlenecked_points += (stats[stat_name] - MAXIMUM_REDUCTION) - level
+            divide_by -= end - capped
+            capped = end
+
+            # Averaging out bottlenecked points
+            if divide_by:
+                level -= bottlenecked_points / divide_by
+
+            # Exit loop if no stat reduction is still larger than the cap
+            if not (capped < len(candidates) and stats[candidates[capped]] - level > MAXIMUM_REDUCTION):
+                break
+
+        bottlenecked = {stat_name: stats[stat_name] - MAXIMUM_REDUCTION for stat_name in candidates[:capped]}
+        for stat_name in affected_stats:
+            stats[stat_name] = bottlenecked.get(stat_name, level)
 
     # Round down all the stats and refund extra points
     for stat_name in stats.keys():
@@ -100,8 +111,8 @@ def order(stats, player_stats):
     # Calculate points spent after shrine
     points_spent_after_shrine = 0
     for stat_name, value in stats.items():
-        if stat_name in racial_stats[player_stats["Race"]]:
-            value -= racial_stats[player_stats["Race"]][stat_name]
+        if stat_name in racial:
+            value -= racial[stat_name]
         points_spent_after_shrine += value
 
     # Calculate spare points
@@ -112,4 +123,156 @@ def order(stats, player_stats):
         for stat_name in affected_stats:
             stats[stat_name] += 1
 
-    return stats #, spare_points
\ No newline at end of file
+    return stats #, spare_points
+
+
+# Highest value any single stat can reach
+MAXIMUM_STAT = 100
+
+
+class ShrineState:
+    """
+    A build's pre-shrine stats plus what order() derives from them (points spent,
+    invested stats, cap candidates sorted by value), kept up to date one stat at a
+    time. What-if edits re-run only the redistribution, and result() is the same
+    dict order() returns for the current stats.
+    """
+
+    def __init__(self, stats, race):
+        self.race = race
+        self.racial = racial_stats[race]
+        self.original = dict(stats)
+        self.reset()
+
+    def reset(self):
+        self.stats = dict(self.original)
+        self.position = {stat_name: i for i, stat_name in enumerate(self.stats)}
+        self.points_start = sum(value - self.racial.get(stat_name, 0) for stat_name, value in self.stats.items())
+        self.affected = set(_affected(self.stats, self.racial))
+        # (-value, position, name) keeps candidates highest first with bisect
+        self._candidates = sorted(
+            (-self.stats[s], self.position[s], s) for s in self.affected if s not in attunements
+        )
+        self._result = None
+
+    def bounds(self, stat_name):
+        return self.racial.get(stat_name, 0), MAXIMUM_STAT
+
+    def adjust(self, stat_name, delta):
+        """Move `delta` points into (or out of) one stat. Returns the change actually applied."""
+        old = self.stats[stat_name]
+        low, high = self.bounds(stat_name)
+        new = min(max(old + delta, low), high)
+        if new == old:
+            return 0
+
+        entry = (-old, self.position[stat_name], stat_name)
+        i = bisect.bisect_left(self._candidates, entry)
+        if i < len(self._candidates) and self._candidates[i] == entry:
+            del self._candidates[i]
+
+        self.stats[stat_name] = new
+        self.points_start += new - old
+        if _is_affected(stat_name, new, self.racial):
+            self.affected.add(stat_name)
+            if stat_name not in attunements:
+                bisect.insort(self._candidates, (-new, self.position[stat_name], stat_name))
+        else:
+            self.affected.discard(stat_name)
+        self._result = None
+        return new - old
+
+    def changes(self):
+        """Stats that differ from the original build, as {stat: delta}."""
+        return {s: v - self.original[s] for s, v in self.stats.items() if v != self.original[s]}
+
+    def result(self):
+        if self._result is None:
+            affected_stats = [s for s in self.stats if s in self.affected]
+            candidates = [name for _, _, name in self._candidates]
+            self._result = _distribute(
+                dict(self.stats), self.racial, self.points_start, affected_stats, candidates, self.position
+            )
+        return dict(self._result)
+
+
+# ---------------------------------------------------------------- batch evaluation
+
+# Canonical column order for order_batch, the order builder stats come in
+STAT_COLUMNS = (
+    "Strength", "Fortitude", "Agility", "Intelligence", "Willpower", "Charisma",
+    "Heavy Wep.", "Medium Wep.", "Light Wep.",
+    "Flamecharm", "Frostdraw", "Thundercall", "Galebreathe", "Shadowcast", "Ironsing", "Bloodrend",
+)
+# Row i of RACIAL_MATRIX holds RACES[i]'s racial stats in STAT_COLUMNS order
+RACES = tuple(racial_stats)
+RACIAL_MATRIX = np.array(
+    [[racial_stats[race].get(stat, 0) for stat in STAT_COLUMNS] for race in RACES], dtype=np.int64
+)
+_ATTUNEMENT_COLUMNS = np.array([stat in attunements for stat in STAT_COLUMNS])
+
+
+def race_indices(races):
+    """Row indices into RACIAL_MATRIX for a sequence of race names."""
+    index = {race: i for i, race in enumerate(RACES)}
+    return np.array([index[race] for race in races], dtype=np.intp)
+
+
+def stats_matrix(stat_dicts):
+    """Stack flat pre-shrine stat dicts (e.g. dwbBuild.flatpre) into a STAT_COLUMNS matrix."""
+    return np.array([[stats.get(stat, 0) for stat in STAT_COLUMNS] for stats in stat_dicts], dtype=np.int64)
+
+
+def order_batch(stats, races):
+    """
+    Shrine of Order for many builds at once.
+
+    `stats` is an (n_builds, len(STAT_COLUMNS)) integer matrix of pre-shrine
+    stats and `races` the matching RACIAL_MATRIX row indices (see race_indices).
+    Returns a new integer matrix of shrined stats; nothing is mutated and no
+    PointsSpent is shared between rows.
+
+    Each row gives exactly what order() returns for a dict of the same stats in
+    STAT_COLUMNS order: the redistribution runs pass by pass over all rows at
+    once, and the points kept by capped stats are summed column by column so
+    the float arithmetic matches the scalar version.
+    """
+    stats = np.asarray(stats, dtype=np.int64)
+    racial = RACIAL_MATRIX[np.asarray(races, dtype=np.intp)]
+    rows = stats.shape[0]
+
+    points_start = (stats - racial).sum(axis=1)
+    affected = (stats > 0) & ~((racial > 0) & (stats - racial == 0))
+    n_affected = affected.sum(axis=1)
+    candidates = affected & ~_ATTUNEMENT_COLUMNS
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        level = np.where(n_affected > 0, points_start / np.maximum(n_affected, 1), 0.0)
+    divide_by = n_affected.copy()
+    capped = np.zeros_like(affected)
+    active = n_affected > 0
+    stats_f = stats.astype(np.float64)
+
+    while active.any():
+        # Stats still losing more than the cap get bottlenecked this pass
+        new = candidates & ~capped & active[:, None] & (stats_f - level[:, None] > MAXIMUM_REDUCTION)
+        kept = (stats_f - MAXIMUM_REDUCTION) - level[:, None]
+        bottlenecked_points = np.zeros(rows)
+        for column in range(stats.shape[1]):
+            hit = new[:, column]
+            bottlenecked_points[hit] = bottlenecked_points[hit] + kept[hit, column]
+
+        divide_by -= new.sum(axis=1)
+        capped |= new
+        spread = active & (divide_by > 0)
+        level[spread] = level[spread] - bottlenecked_points[spread] / divide_by[spread]
+
+        active &= (candidates & ~capped & (stats_f - level[:, None] > MAXIMUM_REDUCTION)).any(axis=1)
+
+    shrined = np.where(capped, stats - MAXIMUM_REDUCTION, np.trunc(np.where(affected, level[:, None], stats_f)))
+    shrined = shrined.astype(np.int64)
+
+    # Refund the points lost to rounding down, as order() does
+    spare_points = points_start - (shrined - racial).sum(axis=1)
+    shrined += affected & (spare_points > n_affected)[:, None]
+    return shrined
@@ -1,47 +1,313 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import weakref
+import asyncio
+import aiohttp
 import requests
 import _HANDLERS as process
+from _HANDLERS.cacheManager import LRUCache
+from plugins.talentStats import get_talent_table, EMPTY_TALENT
+from plugins.ehpEngine import memoized
+
+
+def talent_base():
+    """
+    The current talents snapshot. Read on every use rather than once at import,
+    so a refreshed table reaches the numbers along with ehpEngine.data_version().
+    """
+    return process.get_table('talents')
+
+
+# Warm the talents snapshot so health and EHP calculations never wait on the network
+talent_base()
+
+
+def _outfit_resistance_index(rows):
+    """Map lowercase outfit name -> resistances dict for an outfits snapshot."""
+    index = {}
+    for row in rows:
+        payload = row.get('data') if isinstance(row.get('data'), dict) else row
+        name = payload.get('name')
+        if not name:
+            continue
+        resistances = payload.get('resistances')
+        if resistances is None and isinstance(payload.get('data'), dict):
+            resistances = payload['data'].get('resistances')
+        index.setdefault(name.lower(), resistances or {})
+    return index
+
+
+def outfit_resistances(outfit_name):
+    """Resistances of an outfit by name; served from the shared outfits snapshot."""
+    if not outfit_name:
+        return {}
+    return process.get_table_index('outfits', _outfit_resistance_index).get(outfit_name.lower(), {})
+
+
+# Warm the outfits snapshot so EHP calculations never wait on the network
+process.get_table('outfits')
+
+BUILD_API_URL = 'https://api.deepwoken.co/build'
+BUILD_FETCH_TIMEOUT = float(os.getenv("BUILD_FETCH_TIMEOUT", "8"))
+BUILD_FETCH_RETRIES = int(os.getenv("BUILD_FETCH_RETRIES", "2"))
+BUILD_FETCH_BACKOFF = 0.5
+
+# Parsed builds keyed by builder id, so repeated ehp/stats/validate runs on the
+# same link skip both the API round-trip and the parsing.
+BUILD_CACHE_SIZE = int(os.getenv("BUILD_CACHE_SIZE", "256"))
+BUILD_CACHE_TTL = float(os.getenv("BUILD_CACHE_TTL", "600"))
+_build_cache = LRUCache(maxsize=BUILD_CACHE_SIZE, ttl=BUILD_CACHE_TTL)
+# Different links can point at identical content; share one dwbBuild per fingerprint.
+_builds_by_fingerprint = weakref.WeakValueDictionary()
+
+
+class BuildFetchError(Exception):
+    """Raised when the builder API cannot return a usable build."""
+
+
+def _is_retryable_status(status):
+    return status == 429 or status >= 500
+
+
+def fetch_build_data(build_id):
+    """Blocking fetch of the raw builder JSON (for threads / non-async callers)."""
+    last_exc = None
+    for attempt in range(BUILD_FETCH_RETRIES + 1):
+        if attempt:
+            time.sleep(BUILD_FETCH_BACKOFF * 2 ** (attempt - 1))
+        try:
+            response = requests.get(BUILD_API_URL, params={'id': build_id}, timeout=BUILD_FETCH_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            last_exc = e
+            continue
+        if _is_retryable_status(response.status_code):
+            last_exc = BuildFetchError(f"Builder API returned HTTP {response.status_code}")
+            continue
+        if response.status_code != 200:
+            raise BuildFetchError(f"Builder API returned HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError as e:
+            raise BuildFetchError(f"Builder API returned invalid JSON: {e}") from e
+    raise BuildFetchError(f"Could not reach the builder API: {last_exc}") from last_exc
+
+
+# Pooled HTTP client for the event loop; created lazily on first use.
+_session = None
+_inflight = {}
+
+
+def _get_session():
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=BUILD_FETCH_TIMEOUT),
+        )
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def fetch_build_data_async(build_id):
+    """Awaitable fetch of the raw builder JSON with timeouts and retries."""
+    session = _get_session()
+    last_exc = None
+    for attempt in range(BUILD_FETCH_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(BUILD_FETCH_BACKOFF * 2 ** (attempt - 1))
+        try:
+            async with session.get(BUILD_API_URL, params={'id': build_id}) as response:
+                if _is_retryable_status(response.status):
+                    last_exc = BuildFetchError(f"Builder API returned HTTP {response.status}")
+                    continue
+                if response.status != 200:
+                    raise BuildFetchError(f"Builder API returned HTTP {response.status}")
+                try:
+                    return await response.json(content_type=None)
+                except ValueError as e:
+                    raise BuildFetchError(f"Builder API returned invalid JSON: {e}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_exc = e
+    raise BuildFetchError(f"Could not reach the builder API: {last_exc}") from last_exc
+
+
+def get_build(build_id, force_refresh=False):
+    """Return a parsed dwbBuild, served from the build cache unless force_refresh is set."""
+    build_id = build_id.strip()
+    if not force_refresh:
+        build = _build_cache.get(build_id)
+        if build is not None:
+            return build
+    build = _dedupe(dwbBuild(fetch_build_data(build_id)))
+    _build_cache.set(build_id, build)
+    return build
+
+
+_SHARED_CONTENT = ('traits', 'weapons', 'talents', 'mantras', 'pre', 'post')
+
+def _dedupe(build):
+    existing = _builds_by_fingerprint.get(build.fingerprint)
+    if existing is None:
+        _builds_by_fingerprint[build.fingerprint] = build
+        return build
+    if existing.name == build.name and existing.desc == build.desc:
+        return existing
+    # Same content published under another name: keep the name, share the content
+    for attr in _SHARED_CONTENT:
+        setattr(build, attr, getattr(existing, attr))
+    return build
+
+
+async def _load_build(build_id):
+    build = _dedupe(dwbBuild(await fetch_build_data_async(build_id)))
+    _build_cache.set(build_id, build)
+    return build
+
+
+def _forget_inflight(build_id, task):
+    if _inflight.get(build_id) is task:
+        del _inflight[build_id]
+    if not task.cancelled():
+        task.exception()  # mark as retrieved even if every waiter went away
+
+
+async def get_build_async(build_id, force_refresh=False):
+    """Awaitable get_build(). Concurrent loads of the same id share one request."""
+    build_id = build_id.strip()
+    if not force_refresh:
+        build = _build_cache.get(build_id)
+        if build is not None:
+            return build
+
+    task = _inflight.get(build_id)
+    if task is None or force_refresh:
+        task = asyncio.ensure_future(_load_build(build_id))
+        _inflight[build_id] = task
+        task.add_done_callback(lambda t: _forget_inflight(build_id, t))
+
+    # Shield the shared fetch so one cancelled caller doesn't cancel it for the others
+    return await asyncio.shield(task)
+
+
+def invalidate_build(build_id):
+    _build_cache.pop(build_id.strip())
+
+
+def build_cache_stats():
+    return _build_cache.stats()
+
+
+def _intern_categories(categories):
+    """Copy a {category: {stat: value}} block with interned keys, so every build shares the key strings."""
+    return {
+        sys.intern(cat): {sys.intern(k): v for k, v in values.items()}
+        for cat, values in categories.items()
+    }
 
-talentBase = process.fetch_table('talents')
 
 class dwbBuild:
+    # Builds live in the build cache by the hundreds, so keep them compact:
+    # no __dict__, no raw payload, and derived numbers computed on first use.
+    __slots__ = (
+        'name', 'desc', 'oath', 'outfit', 'race', 'power', 'traits', 'weapons',
+        'talents', 'mantras', 'pre', 'post',
+        '_health', '_flags', '_summary', '_fingerprint', '__weakref__',
+    )
+
     def __str__(self):
         return f"{self.name}\n{self.desc}"
     
-    def __init__(self, build_id):
-        response = requests.get(f'https://api.deepwoken.co/build?id={build_id}')
-        data = response.json()
+    def __init__(self, data):
+        """Parse an already-fetched builder API payload (see fetch_build_data)."""
         stats = data['stats']
-        self.rawdata = response.json()
+        meta = stats['meta']
         self.name = stats['buildName']
-        self.oath = stats['meta']['Oath']
         self.desc = stats['buildDescription']
-        self.talents = data['talents']
-        self.pre = data['preShrine']
-        self.post = data['attributes']
-        self.mantras = data['mantras']
-        self.traits = stats['traits']
-        self.outfit = stats['meta']['Outfit']
-        self.race = stats['meta']['Race']
-
-        self.flatpre = {}
-        self.flatpost = {}
-        for cat in data['preShrine']:
-            for k, v in data['preShrine'][cat].items():
-                self.flatpre[k] = v
-
-        for cat in data['attributes']:
-            for k, v in data['attributes'][cat].items():
-                self.flatpost[k] = v
-
-        self.health = self.calculate_health(stats, self.traits, self.post['base'], self.talents)
-        
-        self.flags = [
-        10 + 0.8*(self.post['base']['Fortitude'] - 65) if 'Reinforced Armor' in set(self.talents) else 0,
-        5.83 + (self.post['base']['Fortitude']-25)*0.16 if self.post['base']['Fortitude'] < 50 and 'To The Finish' in set(self.talents) else 10 if 'To The Finish' in set(self.talents) else 0,
-        self.post['base']['Charisma']*0.15 if 'Chaotic Charm' in set(self.talents) else 0,
-        1 if self.post['base']['Fortitude'] >= 60 and 'Reinforce' in set(self.mantras) else 0
-        ] 
+        self.oath = meta['Oath']
+        self.outfit = meta['Outfit']
+        self.race = sys.intern(meta['Race'])
+        self.power = stats['power']
+        self.traits = {sys.intern(k): v for k, v in stats['traits'].items()}
+        self.weapons = tuple(
+            meta[f'Weapon {i}'] for i in range(1, 4)
+            if meta.get(f'Weapon {i}') and meta[f'Weapon {i}'] != 'None'
+        )
+        self.talents = frozenset(sys.intern(t) for t in data['talents'])
+        self.mantras = frozenset(sys.intern(m) for m in data['mantras'])
+        self.pre = _intern_categories(data['preShrine'])
+        self.post = _intern_categories(data['attributes'])
+
+        self._health = None
+        self._flags = None
+        self._summary = None
+        self._fingerprint = None
+
+    @property
+    def flatpre(self):
+        return {k: v for cat in self.pre.values() for k, v in cat.items()}
+
+    @property
+    def flatpost(self):
+        return {k: v for cat in self.post.values() for k, v in cat.items()}
+
+    @property
+    def fingerprint(self):
+        """
+        Canonical content hash of everything that affects analytics (stats, power,
+        talents, mantras, race, outfit, oath, traits, weapons) - not the name or
+        description. Builder links with identical content share a fingerprint.
+        """
+        if self._fingerprint is None:
+            canonical = {
+                'pre': self.pre,
+                'post': self.post,
+                'power': self.power,
+                'talents': sorted(self.talents),
+                'mantras': sorted(self.mantras),
+                'race': self.race,
+                'outfit': self.outfit,
+                'oath': self.oath,
+                'traits': self.traits,
+                'weapons': list(self.weapons),
+            }
+            payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+            self._fingerprint = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    def cache_key(self, kind, *parts):
+        """Key for caches of results derived from this build (EHP, legality, charts, ...)."""
+        return (self.fingerprint, kind) + parts
+
+    @property
+    def health(self):
+        # Kept per talents snapshot, so a cached build picks up a refreshed table
+        version = process.table_version('talents')
+        if self._health is None or self._health[0] != version:
+            self._health = (version, self.calculate_health({'power': self.power}, self.traits, self.post['base'], self.talents))
+        return self._health[1]
+
+    @property
+    def flags(self):
         #Reinforced Armor, TTF, CCharm, Reinforce
+        if self._flags is None:
+            fortitude = self.post['base']['Fortitude']
+            charisma = self.post['base']['Charisma']
+            self._flags = (
+                10 + 0.8*(fortitude - 65) if 'Reinforced Armor' in self.talents else 0,
+                5.83 + (fortitude-25)*0.16 if fortitude < 50 and 'To The Finish' in self.talents else 10 if 'To The Finish' in self.talents else 0,
+                charisma*0.15 if 'Chaotic Charm' in self.talents else 0,
+                1 if fortitude >= 60 and 'Reinforce' in self.mantras else 0
+            )
+        return self._flags
     
     @classmethod
     def calculate_health(cls, stats, traits, base_attrs, talents):
@@ -52,16 +318,15 @@ class dwbBuild:
         else:
             hp += (fortitude - 50) / 4 + 25
 
+        table = get_talent_table(talent_base())
         for talent in talents:
-            for tb in talentBase:
-                # Match by talent name
-                if tb.get('name') == talent:
-                    health = tb.get('data', {}).get('stats', {}).get('health', 0)
-                    hp += health
-                    break
+            hp += table.get(talent, EMPTY_TALENT).health
         return hp
 
     def ehp(self, params = {'dps':100, 'pen':50, 'kithp': 112, 'kitresis':33}):
+        return memoized(self, 'ehp', params, lambda: self._ehp(params))
+
+    def _ehp(self, params):
         resis = self.scalePhys(params['kitresis'], self.talents, self.outfit)
         scaledDps = params['dps'] * self.resisCoefficient(params['pen'], 10, 50) if self.flags[3] else params['dps']
         EHP = (scaledDps * (self.health + params['kithp']))/((scaledDps)*self.resisCoefficient(params['pen'], resis, self.flags[0]))
@@ -76,8 +341,7 @@ class dwbBuild:
 
     @classmethod
     def scalePhys(cls, kit, talents = {}, outfitName = None):
-        outfit = process.searchTableByName("outfits", outfitName)
-        outfitPhys = outfit.get('data', {}).get('resistances', {}).get('physical', 0) if outfit else 0
+        outfitPhys = outfit_resistances(outfitName).get('physical', 0)
         if "Padded Armor" in talents and "Steel Scales" in talents:
             outfitPhys = outfitPhys + 3 - (3 * outfitPhys/100)
 
@@ -88,25 +352,24 @@ class dwbBuild:
     
     @property
     def summary(self):
-        stat_map = {
-            'Base Health': 'health',
-            'Passive Agility': 'passive agility',
-            'Posture': 'posture',
-            'Ether': 'ether',
-            'Carry load': 'carry load'
-        }
-        summary = {}
-        summary['Base Health'] = self.health
-        summary['Passive Agility'] = 0
-        summary['Posture'] = 0
-        summary['Ether'] = 0
-        summary['Carry load'] = 0
-
-        for talent in self.talents:
-            for tb in talentBase:
-                if tb.get('name') == talent:
-                    stats_dict = tb.get('data', {}).get('stats', {})
-                    for field_label, field_key in stat_map.items():
-                        if field_key != 'health':  # base health handled above
-                            summary[field_label] += stats_dict.get(field_key, 0)
-        return summary
\ No newline at end of file
+        version = process.table_version('talents')
+        if self._summary is None or self._summary[0] != version:
+            summary = {
+                'Base Health': self.health,
+                'Passive Agility': 0,
+                'Posture': 0,
+                'Ether': 0,
+                'Carry load': 0
+            }
+
+            table = get_talent_table(talent_base())
+            for talent in self.talents:
+                ts = table.get(talent)
+                if ts is None:
+                    continue
+                summary['Passive Agility'] += ts.passive_agility
+                summary['Posture'] += ts.posture
+                summary['Ether'] += ts.ether
+                summary['Carry load'] += ts.carry_load
+            self._summary = (version, summary)
+        return dict(self._summary[1])
@@ -0,0 +1,136 @@
+"""
+Content-addressed cache for rendered chart images.
+
+Keys are SHA-256 hashes of the chart type, the renderer version and whatever
+the image depends on (build fingerprint, params, language, data versions), so
+a repeat request for the same chart skips job building and matplotlib entirely.
+
+Images are kept in an in-memory LRU bounded by total bytes (CHART_CACHE_BYTES).
+Set CHART_CACHE_DIR to also keep them on disk across restarts; that tier is
+trimmed to CHART_CACHE_DISK_BYTES, oldest files first.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+from _HANDLERS.cacheManager import LRUCache
+from plugins.renderService import render_service, CHART_RENDERER
+from plugins import imageEncoder
+
+# Bump whenever a renderer's output changes so stale images are never served
+RENDERER_VERSION = 1
+
+CHART_CACHE_BYTES = int(os.getenv("CHART_CACHE_BYTES", str(32 * 1024 * 1024)))
+CHART_CACHE_ENTRIES = int(os.getenv("CHART_CACHE_ENTRIES", "4096"))
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR") or None
+CHART_CACHE_DISK_BYTES = int(os.getenv("CHART_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+# Trim the disk tier every this many writes
+DISK_PRUNE_EVERY = 100
+
+
+def chart_key(kind, *parts):
+    """Hash the chart type, renderer version/backend and everything the image depends on."""
+    payload = json.dumps([RENDERER_VERSION, CHART_RENDERER[kind], imageEncoder.settings(), kind, *parts], separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    def __init__(self, maxbytes=CHART_CACHE_BYTES, directory=CHART_CACHE_DIR, disk_bytes=CHART_CACHE_DISK_BYTES):
+        self._memory = LRUCache(maxsize=CHART_CACHE_ENTRIES, maxbytes=maxbytes)
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self.disk_hits = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.img')
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # keeps the prune order least-recently-used
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Warning: Could not read cached chart {path}: {e}")
+            return None
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so readers never see a partial image
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: Could not write cached chart {path}: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % DISK_PRUNE_EVERY == 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self):
+        """Delete the least recently used images until the disk tier fits its budget."""
+        if not self.directory:
+            return
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.img'):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def get(self, key):
+        data = self._memory.get(key)
+        if data is None and self.directory:
+            data = self._read_disk(key)
+            if data is not None:
+                self.disk_hits += 1
+                self._memory.set(key, data)
+        return data
+
+    def put(self, key, data):
+        self._memory.set(key, data)
+        if self.directory:
+            self._write_disk(key, data)
+
+    def render(self, key, kind, job_factory):
+        """Return the cached image for key, or build the job, render it and cache it."""
+        data = self.get(key)
+        if data is None:
+            data = render_service.render_sync(kind, job_factory())
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        stats = self._memory.stats()
+        stats['disk_hits'] = self.disk_hits
+        stats['directory'] = self.directory
+        return stats
+
+
+# Global instance
+chart_cache = ChartCache()
@@ -0,0 +1,109 @@
+"""
+Reusable matplotlib figures for the chart renderers.
+
+Charts use the object-oriented Figure/Axes API, so no pyplot global state is
+touched. The style is resolved once into a plain rc dict. Each chart keeps
+figure templates keyed by layout: the axes, labels, grid and legend are built
+once, and a render only swaps the data artists before saving.
+"""
+import os
+import math
+import threading
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import rc_context, style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from PIL import Image
+
+from _HANDLERS.cacheManager import LRUCache
+from plugins.imageEncoder import encode, CHART_DPI_SCALE
+
+# Templates kept per process; every distinct layout/language pair is one entry
+CHART_TEMPLATE_CACHE = int(os.getenv("CHART_TEMPLATE_CACHE", "16"))
+_templates = LRUCache(maxsize=CHART_TEMPLATE_CACHE)
+
+
+def chart_style(**overrides):
+    """The seaborn-v0_8-whitegrid style plus overrides, as a plain rc dict."""
+    rc = dict(style.library['seaborn-v0_8-whitegrid'])
+    rc.update(overrides)
+    return rc
+
+
+class FigureTemplate:
+    """
+    A figure whose static parts are drawn once. Use it as a context manager:
+    data artists added through track() are removed again on exit.
+    """
+
+    def __init__(self, rc, figsize, nrows=1, dpi=100):
+        self.rc = rc
+        self._lock = threading.Lock()
+        self._artists = []
+        self.laid_out = False
+        with rc_context(rc):
+            self.figure = Figure(figsize=figsize, dpi=dpi * CHART_DPI_SCALE)
+            FigureCanvasAgg(self.figure)
+            self.axes = list(self.figure.subplots(nrows, 1, squeeze=False)[:, 0])
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            for artist in self._artists:
+                artist.remove()
+            self._artists = []
+        finally:
+            self._lock.release()
+
+    def style(self):
+        return rc_context(self.rc)
+
+    def track(self, artist):
+        self._artists.append(artist)
+        return artist
+
+    def layout(self, pad):
+        # tight_layout is only run for the first render of a template; the
+        # margins it picks are reused after that
+        if not self.laid_out:
+            self.figure.tight_layout(pad=pad)
+            self.laid_out = True
+
+    def encode(self, pad_inches=0.1):
+        """
+        Draw the figure once, crop it to its tight bounding box (what
+        savefig(bbox_inches='tight') does, minus the second draw) and encode it.
+        """
+        canvas = self.figure.canvas
+        with self.style():
+            canvas.draw()
+            bbox = self.figure.get_tightbbox(canvas.get_renderer()).padded(pad_inches)
+        width, height = canvas.get_width_height()
+        dpi = self.figure.dpi
+        box = (
+            max(0, math.floor(bbox.x0 * dpi)),
+            max(0, math.floor(height - bbox.y1 * dpi)),
+            min(width, math.ceil(bbox.x1 * dpi)),
+            min(height, math.ceil(height - bbox.y0 * dpi)),
+        )
+        image = Image.frombuffer('RGBA', (width, height), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        return encode(image.crop(box))
+
+
+def get_template(key, factory):
+    """Return the cached template for key, building it with factory() on a miss."""
+    template = _templates.get(key)
+    if template is None:
+        template = factory()
+        _templates.set(key, template)
+    return template
+
+
+def template_stats():
+    return _templates.stats()
@@ -0,0 +1,104 @@
+import io
+from plugins.ehpEngine import ehp_vs_pen, params_key, data_version, PHYS_KIT, HP_KIT
+from plugins.chartCache import chart_cache, chart_key
+
+
+def ehp_curve_job(build, guild_id=None, scenarios=None):
+    """Plain-data description of the EHP vs penetration chart for the render service."""
+    from utils.language_manager import language_manager
+
+    if scenarios is None:
+        scenarios = [
+            (language_manager.get_text(guild_id, 'phys_kit'), PHYS_KIT),
+            (language_manager.get_text(guild_id, 'hp_kit'), HP_KIT),
+        ]
+
+    series = []
+    for label, params in scenarios:
+        pen, ehp = ehp_vs_pen(build, params)
+        series.append({
+            'label': label,
+            'pen': pen.tolist(),
+            'ehp': ehp.tolist(),
+            'marker': int(params['pen']),
+        })
+    return {
+        'series': series,
+        'xlabel': language_manager.get_text(guild_id, 'penetration') + ' (%)',
+    }
+
+
+COLORS = ['#3c5fa5', '#f42307', '#837C8A', '#13282B']
+
+_style = None
+
+
+def _curve_style():
+    global _style
+    if _style is None:
+        from plugins.chartTemplates import chart_style
+        _style = chart_style(**{
+            'font.family': 'Helvetica Neue',
+            'axes.edgecolor': 'gray',
+            'axes.linewidth': 0.7
+        })
+    return _style
+
+
+def _curve_template(labels, xlabel):
+    """Figure, axis labels, grid and legend for one set of series labels."""
+    from matplotlib.lines import Line2D
+    from plugins.chartTemplates import FigureTemplate
+
+    from utils.font_manager import ensure_fonts
+    ensure_fonts()
+
+    template = FigureTemplate(_curve_style(), figsize=(8, 3.8))
+    with template.style():
+        ax = template.axes[0]
+        ax.set_xlabel(xlabel, fontsize=10, weight='bold', labelpad=4)
+        ax.set_ylabel('EHP', fontsize=10, weight='bold', labelpad=4)
+        ax.tick_params(labelsize=9)
+        ax.set_xlim(0, 100)
+        ax.legend(handles=[
+            Line2D([], [], color=color, linewidth=2, label=label) for label, color in zip(labels, COLORS)
+        ], fontsize=8, loc='upper right', frameon=False)
+        ax.grid(color='#eeeeee', linewidth=0.65, alpha=0.6)
+        ax.set_frame_on(False)
+    return template
+
+
+def render_ehp_curve(job):
+    """Draw an ehp_curve_job() and return the encoded image. Runs inside a render worker."""
+    from plugins.chartTemplates import get_template
+
+    labels = tuple(series['label'] for series in job['series'])
+    template = get_template(('ehpcurve', labels, job['xlabel']), lambda: _curve_template(labels, job['xlabel']))
+
+    with template, template.style():
+        ax = template.axes[0]
+        for series, color in zip(job['series'], COLORS):
+            pen, ehp = series['pen'], series['ehp']
+            template.track(ax.plot(pen, ehp, color=color, linewidth=2)[0])
+            # Mark the default 50% PEN scenario used by the breakdown chart
+            default_idx = series['marker']
+            if 0 <= default_idx < len(ehp):
+                template.track(ax.plot(pen[default_idx], ehp[default_idx], 'o', color=color, markersize=5)[0])
+                template.track(ax.text(pen[default_idx] + 1.5, ehp[default_idx], f'{ehp[default_idx]:.0f}',
+                                       va='bottom', ha='left', fontsize=8, color=color, weight='bold'))
+        ax.relim()
+        ax.autoscale_view(scalex=False)
+
+        template.layout(pad=1.7)
+        return template.encode()
+
+
+def plot_ehp_curve(build, guild_id=None, scenarios=None):
+    """Line chart of EHP against enemy penetration (0-100%) for each kit scenario."""
+    from utils.language_manager import language_manager
+
+    key = chart_key(
+        'ehpcurve', build.fingerprint, language_manager.get_language(guild_id), data_version(),
+        [(label, params_key(params)) for label, params in scenarios] if scenarios is not None else None,
+    )
+    return io.BytesIO(chart_cache.render(key, 'ehpcurve', lambda: ehp_curve_job(build, guild_id, scenarios)))
@@ -0,0 +1,83 @@
+import os
+import numpy as np
+from _HANDLERS.cacheManager import LRUCache
+from _HANDLERS.dataManager import table_version
+
+# Default EHP scenarios (see README "Interpretations")
+PHYS_KIT = {'dps': 100, 'pen': 50, 'kithp': 112, 'kitresis': 33}
+HP_KIT = {'dps': 100, 'pen': 50, 'kithp': 154, 'kitresis': 4}
+
+# Memoised EHP numbers and breakdowns, keyed by build fingerprint, params and
+# the versions of the data snapshots the numbers were derived from.
+EHP_CACHE_SIZE = int(os.getenv("EHP_CACHE_SIZE", "2048"))
+_ehp_cache = LRUCache(maxsize=EHP_CACHE_SIZE)
+
+
+def params_key(params):
+    return (params['dps'], params['pen'], params['kithp'], params['kitresis'])
+
+
+def data_version():
+    return (table_version('talents'), table_version('outfits'))
+
+
+def memoized(build, kind, params, compute):
+    """Return the cached result for (build, kind, params), computing it on a miss."""
+    key = build.cache_key(kind, params_key(params), data_version())
+    result = _ehp_cache.get(key)
+    if result is None:
+        result = compute()
+        _ehp_cache.set(key, result)
+    return result
+
+
+def ehp_cache_stats():
+    return _ehp_cache.stats()
+
+
+def flag_multiplier(flags):
+    """TTF and Chaotic Charm EHP multipliers for a build's flags."""
+    ttf = (30/(100 - flags[1]) + 0.7) if flags[1] != 0 else 1
+    ccharm = (25/(100 - flags[2]) + 0.75) if flags[2] != 0 else 1
+    return ttf * ccharm
+
+
+def ehp_grid(build, dps=100, pen=50, kithp=112, kitresis=33, health=None):
+    """
+    Vectorised dwbBuild.ehp: evaluate EHP over NumPy-broadcastable inputs.
+
+    Each of dps/pen/kithp/kitresis may be a scalar or an array; they broadcast
+    against each other with the usual NumPy rules. `health` defaults to
+    build.health (ehp_breakdown passes its own total). Returns a float array of
+    rounded EHP values with the broadcast shape.
+    """
+    dps, pen, kithp, kitresis = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (dps, pen, kithp, kitresis))
+    )
+    flags = build.flags
+    if health is None:
+        health = build.health
+
+    resis = build.scalePhys(kitresis, build.talents, build.outfit)
+    scaledDps = dps * build.resisCoefficient(pen, 10, 50) if flags[3] else dps
+    EHP = (scaledDps * (health + kithp))/(scaledDps * build.resisCoefficient(pen, resis, flags[0]))
+    EHP = EHP * flag_multiplier(flags)
+    return np.round(EHP)
+
+
+def ehp_sweep(build, dps=(100,), pen=(50,), kithp=(112,), kitresis=(33,)):
+    """
+    EHP over the full cartesian grid of the given parameter values.
+
+    Returns an array of shape (len(dps), len(pen), len(kithp), len(kitresis)).
+    """
+    grids = np.ix_(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in (dps, pen, kithp, kitresis)))
+    return ehp_grid(build, *grids)
+
+
+def ehp_vs_pen(build, params, pen=None):
+    """EHP curve over penetration (0-100% by default) for one kit scenario."""
+    if pen is None:
+        pen = np.arange(0, 101)
+    pen = np.asarray(pen, dtype=float)
+    return pen, ehp_grid(build, params['dps'], pen, params['kithp'], params['kitresis'])
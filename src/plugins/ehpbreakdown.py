@@ -1,60 +1,49 @@
 import io
+from plugins.talentStats import get_talent_table
+from plugins.ehpEngine import memoized, flag_multiplier, params_key, data_version
+from plugins.chartCache import chart_cache, chart_key
 
 def ehp_breakdown(build, talentBase, params={'dps':100, 'pen':50, 'kithp': 112, 'kitresis':33}):
+    # Callers may mutate the result (plot_breakdown pops 'Final EHP'), so hand out copies
+    return dict(memoized(build, 'breakdown', params, lambda: _ehp_breakdown(build, talentBase, params)))
+
+
+def _ehp_breakdown(build, talentBase, params):
     breakdown = {}
 
     vitality_bonus = build.traits['Vitality'] * 10
     breakdown['Trait'] = vitality_bonus
 
-    power_bonus = build.rawdata['stats']['power'] * 4
+    power_bonus = build.power * 4
     breakdown['Power'] = power_bonus
 
     breakdown['Base HP'] = 200
 
-    for stat in build.post['base']:
-        
+    table = get_talent_table(talentBase)
+    talent_stats = [table[t] for t in build.talents if t in table]
+    base_stats = build.post['base']
+    attunements = build.post.get('attunements', {})
+
+    for stat in base_stats:
         if stat == 'Fortitude':
-            f = build.post['base'][stat]
-            fort_hp = f/2 if f <= 50 else (f - 50)/4 + 25
-            breakdown['Fortitude'] = fort_hp
-
-        
-        stat_health_talents = 0
-        for talent in build.talents:
-            for tb in talentBase:
-                if tb.get('name') == talent:
-                    if tb.get('data', {}).get('stats', {}).get(stat, 0) != 0:
-                        stat_health_talents += tb.get('data', {}).get('stats', {}).get('health', 0)
+            f = base_stats[stat]
+            breakdown['Fortitude'] = f/2 if f <= 50 else (f - 50)/4 + 25
+
+        stat_health_talents = sum(ts.health for ts in talent_stats if stat in ts.stats)
         if stat_health_talents:
             breakdown[f'{stat} health talents'] = stat_health_talents
 
-    
     attunement_health = 0
-    attunements = build.post.get('attunements', {})
     for attunement in attunements:
-        
-        for talent in build.talents:
-            for tb in talentBase:
-                if tb.get('name') == talent:
-                    if tb.get('data', {}).get('attunements', {}).get(attunement, 0) != 0:
-                        attunement_health += tb.get('data', {}).get('stats', {}).get('health', 0)
+        attunement_health += sum(ts.health for ts in talent_stats if attunement in ts.attunements)
     if attunement_health:
         breakdown['Attunement health talents'] = attunement_health
 
-    
-    misc_health = 0
-    for talent in build.talents:
-        for tb in talentBase:
-            if tb.get('name') == talent:
-                health_value = tb.get('data', {}).get('stats', {}).get('health', 0)
-                if health_value:
-                    already_counted = False
-                    for key in breakdown:
-                        if key.endswith('health talents') and health_value in breakdown[key:]:
-                            already_counted = True
-                            break
-                    if not already_counted:
-                        misc_health += health_value
+    # Health talents not already attributed to a stat or attunement above
+    misc_health = sum(
+        ts.health for ts in talent_stats
+        if ts.health and ts.stats.isdisjoint(base_stats) and ts.attunements.isdisjoint(attunements)
+    )
     if misc_health:
         breakdown['+HP Talents'] = misc_health
 
@@ -72,7 +61,7 @@ def ehp_breakdown(build, talentBase, params={'dps':100, 'pen':50, 'kithp': 112,
     return breakdown
 
 
-def plot_breakdown(build, talentBase, params={'dps':100, 'pen':50, 'kithp':112, 'kitresis':33}):
+def _breakdown_series(build, talentBase, params):
     breakdown = ehp_breakdown(build, talentBase, params)
     
     # Extract Final EHP
@@ -87,86 +76,128 @@ def plot_breakdown(build, talentBase, params={'dps':100, 'pen':50, 'kithp':112,
     mag_factor = 1 / build.resisCoefficient(params['pen'], kitresis, flags[0])
     
     # Apply additional multipliers from flags
-    flag_mult = 1.0
-    flag_mult *= ((30/(100 - flags[1]) + 0.7) if flags[1] != 0 else 1)
-    flag_mult *= ((25/(100 - flags[2]) + 0.75) if flags[2] != 0 else 1)
-    
-    total_mag_factor = mag_factor * flag_mult
+    total_mag_factor = mag_factor * flag_multiplier(flags)
     
     components = list(breakdown.keys())
     values = list(breakdown.values())
     
     # Scale all values by the resistance and flag multipliers for EHP display
     mag_values = [v * total_mag_factor for v in values]
-    
-    # Calculate kit HP contribution to EHP
-    kit_ehp = params['kithp'] * total_mag_factor
-
-    # Lazy import matplotlib
-    import matplotlib
-    matplotlib.use('Agg')
-    # Reduce matplotlib logging noise in some environments
-    try:
-        matplotlib.set_loglevel("error")
-    except Exception:
-        pass
-    import matplotlib.pyplot as plt
-    
+
+    return components, values, mag_values, ehp_val
+
+
+BAR_HEIGHT = 0.32
+COLOR_RAW = "#f42307"
+COLOR_EHP = '#3c5fa5'
+COLOR_FINAL = "#837C8A"
+
+_style = None
+
+
+def _breakdown_style():
+    global _style
+    if _style is None:
+        from plugins.chartTemplates import chart_style
+        _style = chart_style(**{
+            'font.family': 'Helvetica Neue',
+            'axes.edgecolor': 'gray',
+            'axes.linewidth': 0.7
+        })
+    return _style
+
+
+def _breakdown_template(n):
+    """Figure with n stacked panels: axis labels, grid, fixed 0-800 scale and legend."""
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from plugins.chartTemplates import FigureTemplate
+
     # Register custom fonts
-    try:
-        from utils.font_manager import _fonts_registered
-    except Exception:
-        pass
-    
-    plt.figure(figsize=(8, 3.8))
-    plt.style.use('seaborn-v0_8-whitegrid')
-    plt.rcParams.update({
-        'font.family': 'Helvetica Neue',
-        'axes.edgecolor': 'gray',
-        'axes.linewidth': 0.7
-    })
-    
+    from utils.font_manager import ensure_fonts
+    ensure_fonts()
+
+    template = FigureTemplate(_breakdown_style(), figsize=(8, 3.8 * n), nrows=n)
+    with template.style():
+        for ax in template.axes:
+            ax.set_xlabel('Health Contribution', fontsize=10, weight='bold', labelpad=4)
+            ax.tick_params(labelsize=9)
+            ax.grid(axis='x', color='#eeeeee', linewidth=0.65, alpha=0.6)
+            # Fixed x-axis scale of 800
+            ax.set_xlim(0, 800)
+            for spine in ax.spines.values():
+                spine.set_visible(False)
+            # The Final EHP entry's text is filled in per render
+            ax.legend(handles=[
+                Line2D([], [], color=COLOR_FINAL, linestyle='--', linewidth=1.2, label='Final EHP'),
+                Patch(facecolor=COLOR_RAW, edgecolor="#333333", linewidth=0.8, label="Raw"),
+                Patch(facecolor=COLOR_EHP, alpha=0.24, edgecolor="#333333", linewidth=0.6, label="EHP w/ PEN/Resist"),
+            ], fontsize=8, loc='lower right', frameon=False)
+    return template
+
+
+def _draw_breakdown(template, ax, components, values, mag_values, ehp_val):
+    ys = range(len(components))
+
     # Plot raw HP values and EHP values
-    bars1 = plt.barh(components, values, height=0.32, color="#f42307", 
-                     label="Raw", edgecolor="#333333", linewidth=0.8)
-    bars2 = plt.barh(components, mag_values, height=0.32, color='#3c5fa5', 
-                     alpha=0.24, label="EHP w/ PEN/Resist", edgecolor="#333333", linewidth=0.6)
-    
+    template.track(ax.barh(ys, values, height=BAR_HEIGHT, color=COLOR_RAW,
+                           edgecolor="#333333", linewidth=0.8))
+    template.track(ax.barh(ys, mag_values, height=BAR_HEIGHT, color=COLOR_EHP,
+                           alpha=0.24, edgecolor="#333333", linewidth=0.6))
+
     # Add Final EHP line at the actual calculated position
+    legend = ax.get_legend()
+    legend.legend_handles[0].set_visible(bool(ehp_val))
+    legend.get_texts()[0].set_visible(bool(ehp_val))
     if ehp_val:
-        plt.axvline(ehp_val, color="#837C8A", linestyle='--', 
-                   label=f'Final EHP = {ehp_val:.0f}', linewidth=1.2)
-    
+        template.track(ax.axvline(ehp_val, color=COLOR_FINAL, linestyle='--', linewidth=1.2))
+        legend.get_texts()[0].set_text(f'Final EHP = {ehp_val:.0f}')
+
     # Add value labels
-    for bar, value, magv in zip(bars1, values, mag_values):
+    for y, value, magv in zip(ys, values, mag_values):
         # Raw value label (centered in red bar)
-        plt.text(value/2, bar.get_y() + bar.get_height() / 2,
-                 f'{value:.0f}', va='center', ha='center', 
-                 fontsize=9, color='white', weight='bold')
-        
+        template.track(ax.text(value/2, y, f'{value:.0f}', va='center', ha='center',
+                               fontsize=9, color='white', weight='bold'))
+
         # EHP value label (to the right of blue bar)
         if magv > value:  # Only show if visible
-            plt.text(magv + 8, bar.get_y() + bar.get_height() / 2,
-                     f'{magv:.0f}', va='center', ha='left', 
-                     fontsize=8, color='#205375', weight='bold')
-    
-    plt.xlabel('Health Contribution', fontsize=10, weight='bold', labelpad=4)
-    plt.xticks(fontsize=9)
-    plt.yticks(fontsize=9)
-    plt.legend(fontsize=8, loc='lower right', frameon=False)
-    plt.grid(axis='x', color='#eeeeee', linewidth=0.65, alpha=0.6)
-    
-    # Fixed x-axis scale of 800
-    plt.xlim(0, 800)
-    
-    plt.tight_layout(pad=1.7)
-    plt.box(False)
-    
-    buf = io.BytesIO()
-    try:
-        plt.savefig(buf, format='png', bbox_inches='tight')
-    finally:
-        buf.seek(0)
-        plt.close()
-    
-    return buf
+            template.track(ax.text(magv + 8, y, f'{magv:.0f}', va='center', ha='left',
+                                   fontsize=8, color='#205375', weight='bold'))
+
+    # Same limits the categorical axis would autoscale to
+    lo, hi = -BAR_HEIGHT/2, len(components) - 1 + BAR_HEIGHT/2
+    pad = (hi - lo) * 0.05
+    ax.set_ylim(lo - pad, hi + pad)
+    ax.set_yticks(ys, components)
+
+
+def breakdown_job(build, talentBase, params_list):
+    """Plain-data description of the breakdown chart (one panel per params dict)."""
+    return {'panels': [_breakdown_series(build, talentBase, params) for params in params_list]}
+
+
+def render_breakdowns(job):
+    """Draw a breakdown_job() and return the encoded image. Runs inside a render worker."""
+    from plugins.chartTemplates import get_template
+
+    panels = job['panels']
+    template = get_template(('breakdown', len(panels)), lambda: _breakdown_template(len(panels)))
+
+    with template, template.style():
+        for ax, panel in zip(template.axes, panels):
+            _draw_breakdown(template, ax, *panel)
+        template.layout(pad=1.7)
+        return template.encode()
+
+
+def plot_breakdowns(build, talentBase, params_list):
+    """
+    Render one breakdown panel per params dict, stacked top to bottom in a single
+    figure, and encode it once. Returns an image buffer ready for discord.File.
+    """
+    key = chart_key('breakdown', build.fingerprint, [params_key(p) for p in params_list], data_version())
+    return io.BytesIO(chart_cache.render(key, 'breakdown', lambda: breakdown_job(build, talentBase, params_list)))
+
+
+def plot_breakdown(build, talentBase, params={'dps':100, 'pen':50, 'kithp':112, 'kitresis':33}):
+    return plot_breakdowns(build, talentBase, [params])
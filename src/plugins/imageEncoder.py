@@ -0,0 +1,86 @@
+"""
+Output encoding for chart images.
+
+Renderers hand over a PIL image and get upload-ready bytes back. Upload size
+drives how long followup.send/channel.send take, so the format and budget are
+configurable:
+
+    CHART_FORMAT     png (default), png8 (palette-quantized PNG) or webp
+    CHART_QUALITY    WebP quality, 1-100 (default 85)
+    CHART_COLORS     palette size for png8 (default 256)
+    CHART_DPI_SCALE  multiplier on every chart's native resolution (default 1.0)
+    CHART_MAX_BYTES  per-upload byte budget (default 1 MiB); images over it are
+                     re-encoded at lower quality, then downscaled, until they fit
+
+Attachment names must carry the matching extension; use chart_filename().
+"""
+import io
+import os
+
+from PIL import Image
+
+FORMATS = {'png': 'png', 'png8': 'png', 'webp': 'webp'}
+
+
+def _format():
+    fmt = os.getenv("CHART_FORMAT", "png").lower()
+    if fmt not in FORMATS:
+        print(f"Warning: Unknown CHART_FORMAT {fmt!r}, using png")
+        fmt = 'png'
+    return fmt
+
+
+CHART_FORMAT = _format()
+CHART_QUALITY = int(os.getenv("CHART_QUALITY", "85"))
+CHART_COLORS = int(os.getenv("CHART_COLORS", "256"))
+CHART_DPI_SCALE = float(os.getenv("CHART_DPI_SCALE", "1.0"))
+CHART_MAX_BYTES = int(os.getenv("CHART_MAX_BYTES", str(1024 * 1024)))
+
+# Never shrink charts below this width while fitting the byte budget
+MIN_WIDTH = 480
+
+
+def chart_filename(name):
+    """Attachment filename for a chart, e.g. chart_filename('evo_plot') -> 'evo_plot.webp'."""
+    return f"{name}.{FORMATS[CHART_FORMAT]}"
+
+
+def settings():
+    """Everything that changes the encoded bytes, for cache keys."""
+    return [CHART_FORMAT, CHART_QUALITY, CHART_COLORS, CHART_DPI_SCALE, CHART_MAX_BYTES]
+
+
+def _encode_once(image, fmt, quality):
+    buf = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buf, format='WEBP', quality=quality, method=4)
+    elif fmt == 'png8':
+        image.quantize(colors=CHART_COLORS, method=Image.Quantize.FASTOCTREE).save(buf, format='PNG', optimize=True)
+    else:
+        image.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def encode(image, scale=1.0):
+    """
+    Encode a chart image in the configured format within the byte budget.
+
+    `scale` is any resolution change the renderer could not apply itself
+    (matplotlib renderers apply CHART_DPI_SCALE through the dpi and pass 1.0).
+    """
+    image = image.convert('RGB')
+    if scale != 1.0:
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.LANCZOS)
+
+    quality = CHART_QUALITY
+    data = _encode_once(image, CHART_FORMAT, quality)
+    # Lossy formats first trade quality, then everything trades resolution
+    while len(data) > CHART_MAX_BYTES and CHART_FORMAT == 'webp' and quality > 50:
+        quality = max(50, quality - 15)
+        data = _encode_once(image, CHART_FORMAT, quality)
+    while len(data) > CHART_MAX_BYTES and image.width * 0.8 >= MIN_WIDTH:
+        image = image.resize((round(image.width * 0.8), round(image.height * 0.8)), Image.LANCZOS)
+        data = _encode_once(image, CHART_FORMAT, quality)
+    if len(data) > CHART_MAX_BYTES:
+        print(f"Warning: Chart is {len(data)} bytes, over the {CHART_MAX_BYTES} byte budget")
+    return data
@@ -1,37 +1,122 @@
 import json
+import os
+
+import numpy as np
 
 STAT_ORDER = ['Health', 'Ether', 'Physical armor', 'Elemental armor', 'Sanity', 'Posture']
 SLOT_ORDER = ['Head', 'Face', 'Ears', 'Torso', 'Arms', 'Legs', 'Rings']
+RARITY_ORDER = ['common', 'uncommon', 'rare', 'legendary']
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(current_dir, '..', '..')
+PIP_FILE = os.path.join(project_root, 'data', 'pipvalues.json')
+
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_ORDER)}
+# Slots outside SLOT_ORDER get no pip values, only the Sanity -> Ether bonus
+SLOT_INDEX = {slot: i for i, slot in enumerate(SLOT_ORDER)}
+OTHER_SLOT = len(SLOT_ORDER)
+RARITY_INDEX = {rarity: i for i, rarity in enumerate(RARITY_ORDER)}
+
 
 def load_pip_data():
-    pip_file = 'data/pipvalues.json'
-    with open(pip_file, 'r') as f:
+    with open(PIP_FILE, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+
+def compile_pip_data(pip_data):
+    """
+    Flatten pipvalues.json into arrays:
+
+    PIP_VECTORS[slot, rarity, stat] is everything one pip of `stat` adds on that
+    slot and rarity, as a STAT_ORDER vector (the pip itself, plus the Ether a
+    Sanity pip brings). STAR_HP[slot] is the 3-star Health bonus.
+    """
+    vectors = np.zeros((len(SLOT_ORDER) + 1, len(RARITY_ORDER), len(STAT_ORDER), len(STAT_ORDER)), dtype=np.int64)
+    for stat, slots in pip_data['pip_values'].items():
+        if stat not in STAT_INDEX:
+            continue
+        for slot, rarities in slots.items():
+            if slot not in SLOT_INDEX:
+                continue
+            for rarity, value in rarities.items():
+                if rarity in RARITY_INDEX:
+                    vectors[SLOT_INDEX[slot], RARITY_INDEX[rarity], STAT_INDEX[stat], STAT_INDEX[stat]] += value
+    for rarity, value in pip_data['sanity_ether_bonus'].items():
+        if rarity in RARITY_INDEX:
+            vectors[:, RARITY_INDEX[rarity], STAT_INDEX['Sanity'], STAT_INDEX['Ether']] += value
+
+    star_hp = np.zeros(len(SLOT_ORDER) + 1, dtype=np.int64)
+    for slot, value in pip_data['star_hp_bonus'].items():
+        if slot in SLOT_INDEX:
+            star_hp[SLOT_INDEX[slot]] = value
+    return vectors, star_hp
+
+
 PIP_DATA = load_pip_data()
+PIP_VECTORS, STAR_HP = compile_pip_data(PIP_DATA)
 
-def calculate_kit_stats(item):
-    stats = {}
-    slot = item.get('slot', '')
-    
+
+def _pip_indices(item):
+    """(slot, rarity, stat) index arrays of every pip on an item, plus the slot index."""
+    slot = SLOT_INDEX.get(item.get('slot', ''), OTHER_SLOT)
+    rarities, stats = [], []
+    for rarity, selections in (item.get('pipSelections') or {}).items():
+        r = RARITY_INDEX.get(rarity)
+        if r is None:
+            continue
+        for stat_type in selections:
+            s = STAT_INDEX.get(stat_type)
+            if s is not None:
+                rarities.append(r)
+                stats.append(s)
+    return slot, rarities, stats
+
+
+def _innates(item, totals, extra):
+    """Add an item's innate stats to a STAT_ORDER list; stats outside STAT_ORDER go to `extra`."""
     for i in range(1, 5):
         innate = item.get(f'innate_{i}', {})
         if innate.get('type') == 'none':
             continue
         stat_type = 'Health' if innate.get('type') == 'Hp' else innate.get('type')
-        stats[stat_type] = stats.get(stat_type, 0) + innate.get('stat', 0)
-    
-    if item.get('stars', 0) == 3 and slot in PIP_DATA['star_hp_bonus']:
-        stats['Health'] = stats.get('Health', 0) + PIP_DATA['star_hp_bonus'][slot]
-    
-    pip_values = PIP_DATA['pip_values']
-    for rarity, selections in item.get('pipSelections', {}).items():
-        for stat_type in selections:
-            if stat_type in pip_values and slot in pip_values[stat_type]:
-                if rarity in pip_values[stat_type][slot]:
-                    stats[stat_type] = stats.get(stat_type, 0) + pip_values[stat_type][slot][rarity]
-            
-            if stat_type == 'Sanity' and rarity in PIP_DATA['sanity_ether_bonus']:
-                stats['Ether'] = stats.get('Ether', 0) + PIP_DATA['sanity_ether_bonus'][rarity]
-    
-    return stats
\ No newline at end of file
+        if stat_type in STAT_INDEX:
+            totals[STAT_INDEX[stat_type]] += innate.get('stat', 0)
+        else:
+            extra[stat_type] = extra.get(stat_type, 0) + innate.get('stat', 0)
+
+
+def kit_totals(items):
+    """
+    Summed stats of a list of kit items, as {stat: value} with zero stats left out.
+    Every pip of every item is gathered into one index array, so the pip
+    values come from a single lookup and sum over the compiled tables.
+    """
+    slots, rarities, stats = [], [], []
+    star_slots = []
+    totals = [0] * len(STAT_ORDER)
+    extra = {}
+    for item in items or []:
+        slot, item_rarities, item_stats = _pip_indices(item)
+        slots.extend([slot] * len(item_stats))
+        rarities.extend(item_rarities)
+        stats.extend(item_stats)
+        if item.get('stars', 0) == 3:
+            star_slots.append(slot)
+        _innates(item, totals, extra)
+
+    pips = PIP_VECTORS[slots, rarities, stats].sum(axis=0) if stats else np.zeros(len(STAT_ORDER), dtype=np.int64)
+    pips[STAT_INDEX['Health']] += STAR_HP[star_slots].sum()
+
+    result = {}
+    for stat, innate, pip in zip(STAT_ORDER, totals, pips.tolist()):
+        if innate + pip:
+            result[stat] = innate + pip
+    for stat, value in extra.items():
+        if value:
+            result[stat] = result.get(stat, 0) + value
+    return result
+
+
+def calculate_kit_stats(item):
+    """Stats of one kit item, as {stat: value}."""
+    return kit_totals([item])
@@ -1,8 +1,50 @@
-
 import discord
 import os
-from pathlib import Path
 import re
+import time
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+
+from _HANDLERS.cacheManager import LRUCache
+
+# Notes in [] or () are stripped from both banned-list lines and build items before matching
+NOTES_PATTERN = re.compile(r'\[.*?\]|\(.*?\)')
+
+CATEGORY_FILES = {
+    'weapons': 'bannedweapons.txt',
+    'mantras': 'bannedmantras.txt',
+    'talents': 'bannedtalents.txt',
+    'oaths': 'bannedoaths.txt'
+}
+
+# wars reads data/banned/ itself; other modes read data/banned/<mode>/ when it exists
+MODES = ('wars', 'depths', 'glads')
+DEFAULT_MODE = 'wars'
+
+# Seconds between checks for edited banned lists (0 disables the watcher)
+BANNED_RELOAD_INTERVAL = float(os.getenv("BANNED_RELOAD_INTERVAL", "30"))
+# Results kept per (build fingerprint, ruleset version, modes)
+LEGALITY_CACHE_SIZE = int(os.getenv("LEGALITY_CACHE_SIZE", "512"))
+
+
+def normalize(name):
+    """Base name used for matching: notes removed, whitespace trimmed."""
+    return NOTES_PATTERN.sub('', name).strip()
+
+
+# Compiled banned lists. A snapshot is never modified; reloading builds a new
+# one and swaps it in with a single assignment, so a check never sees a mix.
+Rules = namedtuple('Rules', [
+    'rulesets',   # mode -> category -> read-only {base_name: full_line_with_notes}
+    'index',      # category -> {base_name: ((mode, full_line), ...)}, every mode in one lookup
+    'version',    # short hash of every banned file's path and contents
+    'updated',    # modification time of the newest banned file (epoch seconds), or None
+    'signature',  # (path, mtime_ns, size) of every banned file, to spot changes cheaply
+])
 
 
 class BuildLegalityChecker:
@@ -13,144 +55,237 @@ class BuildLegalityChecker:
             project_root = os.path.join(current_dir, '..', '..')
             banned_data_dir = os.path.join(project_root, 'data', 'banned')
         self.banned_data_dir = Path(banned_data_dir)
-        # Store as dict with base_name: full_line_with_notes
-        self.banned = {
-            'weapons': {},
-            'mantras': {},
-            'talents': {},
-            'oaths': {}
-        }
-        self._load_banned_items()
-
-    def _load_banned_items(self):
-        file_mapping = {
-            'weapons': 'bannedweapons.txt',
-            'mantras': 'bannedmantras.txt',
-            'talents': 'bannedtalents.txt',
-            'oaths': 'bannedoaths.txt'
-        }
+        self.rules = None
+        # (fingerprint, ruleset version, modes) -> result; a rules change changes every key
+        self._results = LRUCache(maxsize=LEGALITY_CACHE_SIZE)
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self.reload()
 
-        for category, filename in file_mapping.items():
-            filepath = self.banned_data_dir / filename
-            if filepath.exists():
-                self._parse_banned_file(filepath, category)
-
-    def _parse_banned_file(self, filepath, category):
-        """Read text file and store base name (without [] or ()) mapped to full line"""
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    # Extract base name (remove content in [] and ())
-                    base_name = re.sub(r'\[.*?\]|\(.*?\)', '', line).strip()
-                    # Store mapping: base_name -> full line with notes
-                    self.banned[category][base_name] = line
+    @property
+    def rulesets(self):
+        return self.rules.rulesets
 
-    def check_build(self, build, modes=None):
-        """
-        Check build legality
-        modes: list of strings like ['wars', 'depths', 'glads'] or None for default 'wars'
-        """
-        if modes is None:
-            modes = ['wars']
+    @property
+    def version(self):
+        return self.rules.version
 
-        violations = []
+    @property
+    def banned(self):
+        """The default mode's banned lists, as category -> {base_name: full line}."""
+        return self.rules.rulesets.get(DEFAULT_MODE, {})
 
-        violations.extend(self._check_weapons(build))
-        violations.extend(self._check_mantras(build))
-        violations.extend(self._check_talents(build))
-        violations.extend(self._check_oath(build))
+    def _mode_dir(self, mode):
+        return self.banned_data_dir if mode == DEFAULT_MODE else self.banned_data_dir / mode
 
-        return {
-            'is_legal': len(violations) == 0,
-            'violations': violations,
-            'modes': modes
-        }
+    def _files(self):
+        """Every banned list file on disk, as (mode, category, path)."""
+        for mode in MODES:
+            mode_dir = self._mode_dir(mode)
+            if not mode_dir.is_dir():
+                continue
+            for category, filename in CATEGORY_FILES.items():
+                yield mode, category, mode_dir / filename
 
-    def _check_weapons(self, build):
-        violations = []
-        weapons = []
+    def _signature(self):
+        signature = []
+        for _, _, filepath in self._files():
+            try:
+                stat = filepath.stat()
+            except OSError:
+                continue
+            signature.append((str(filepath), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
 
-        if hasattr(build, 'rawdata'):
-            stats = build.rawdata.get('stats', {})
-            meta = stats.get('meta', {})
+    def _compile(self):
+        signature = self._signature()
+        digest = hashlib.sha256()
+        rulesets, index = {}, {category: {} for category in CATEGORY_FILES}
+        for mode in MODES:
+            if self._mode_dir(mode).is_dir():
+                rulesets[mode] = {category: {} for category in CATEGORY_FILES}
+        for mode, category, filepath in self._files():
+            if not filepath.exists():
+                continue
+            raw = filepath.read_bytes()
+            digest.update(f"{filepath.relative_to(self.banned_data_dir).as_posix()}\0".encode('utf-8'))
+            digest.update(raw + b"\0")
+            entries = self._parse_banned_lines(raw.decode('utf-8', errors='replace').splitlines())
+            rulesets[mode][category] = entries
+            for base_name, line in entries.items():
+                index[category].setdefault(base_name, []).append((mode, line))
 
-            for i in range(1, 4):
-                weapon_key = f'Weapon {i}'
-                if weapon_key in meta:
-                    weapon_name = meta[weapon_key]
-                    if weapon_name and weapon_name != 'None':
-                        weapons.append(weapon_name)
+        return Rules(
+            rulesets=MappingProxyType({
+                mode: MappingProxyType({c: MappingProxyType(e) for c, e in ruleset.items()})
+                for mode, ruleset in rulesets.items()
+            }),
+            index={category: {name: tuple(hits) for name, hits in entries.items()} for category, entries in index.items()},
+            version=digest.hexdigest()[:10],
+            updated=max((mtime_ns / 1e9 for _, mtime_ns, _ in signature), default=None),
+            signature=signature,
+        )
 
-        for weapon in weapons:
-            # Remove brackets/parentheses from weapon for matching
-            base_weapon = re.sub(r'\[.*?\]|\(.*?\)', '', weapon).strip()
+    def reload(self):
+        """Recompile the banned lists from disk and swap them in. Returns True if the rules changed."""
+        with self._reload_lock:
+            try:
+                rules = self._compile()
+            except Exception as e:
+                if self.rules is None:
+                    raise
+                print(f"Warning: Could not reload banned lists, keeping ruleset {self.rules.version}: {e}")
+                return False
+            changed = self.rules is None or rules.version != self.rules.version
+            if changed and self.rules is not None:
+                print(f"✓ Banned lists reloaded: ruleset {self.rules.version} -> {rules.version}")
+            self.rules = rules
+            return changed
 
-            if base_weapon in self.banned['weapons']:
-                # Return the full line with notes from the text file
-                violations.append(self.banned['weapons'][base_weapon])
+    def refresh(self):
+        """Reload only if a banned file was added, removed or modified since the last load."""
+        if self._signature() != self.rules.signature:
+            return self.reload()
+        return False
 
-        return violations
+    def start_watching(self, interval=None):
+        """Poll the banned lists every `interval` seconds in a daemon thread. Safe to call repeatedly."""
+        interval = BANNED_RELOAD_INTERVAL if interval is None else interval
+        if interval <= 0 or self._watcher is not None:
+            return
 
-    def _check_mantras(self, build):
-        violations = []
-        mantras = build.mantras if hasattr(build, "mantras") else []
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Warning: Banned list watcher error: {e}")
 
-        for mantra in mantras:
-            # Remove brackets/parentheses for matching
-            base_mantra = re.sub(r'\[.*?\]|\(.*?\)', '', mantra).strip()
+        self._watcher = threading.Thread(target=watch, name="banned-list-watcher", daemon=True)
+        self._watcher.start()
 
-            if base_mantra in self.banned["mantras"]:
-                violations.append(self.banned["mantras"][base_mantra])
+    def _parse_banned_lines(self, lines):
+        """Map base name (without [] or ()) to the full line"""
+        entries = {}
+        for line in lines:
+            line = line.strip()
+            if line:
+                entries[normalize(line)] = line
+        return entries
 
-        return violations
+    def _build_items(self, build):
+        """(category, name) for everything in the build that a banned list can cover, in report order."""
+        for weapon in getattr(build, 'weapons', ()):
+            yield 'weapons', weapon
+        for mantra in sorted(getattr(build, 'mantras', ())):
+            yield 'mantras', mantra
+        for talent in sorted(getattr(build, 'talents', ())):
+            yield 'talents', talent
+        oath = getattr(build, 'oath', None)
+        if oath and oath != 'None':
+            yield 'oaths', oath
 
-    def _check_talents(self, build):
-        violations = []
-        talents = build.talents if hasattr(build, "talents") else []
+    def check_build(self, build, modes=None):
+        """
+        Check build legality
+        modes: list of strings like ['wars', 'depths', 'glads'] or None for default 'wars'
 
-        for talent in talents:
-            # Remove brackets/parentheses for matching
-            base_talent = re.sub(r'\[.*?\]|\(.*?\)', '', talent).strip()
+        Every requested mode is checked in one pass over the build's items.
+        'by_mode' holds each mode's violations; modes without a ruleset on
+        disk are listed in 'unchecked_modes'. 'status' is 'illegal' if any
+        checked mode has a violation, 'unchecked' if none do but some mode
+        could not be checked, else 'legal'; 'is_legal' is status == 'legal'.
+        """
+        if modes is None:
+            modes = [DEFAULT_MODE]
+        modes = list(dict.fromkeys(modes))
+        # One snapshot for the whole check, even if a reload lands meanwhile
+        rules = self.rules
 
-            if base_talent in self.banned["talents"]:
-                violations.append(self.banned["talents"][base_talent])
+        fingerprint = getattr(build, 'fingerprint', None)
+        key = (fingerprint, rules.version, tuple(modes))
+        if fingerprint is not None:
+            cached = self._results.get(key)
+            if cached is not None:
+                return cached
 
-        return violations
+        by_mode = {mode: [] for mode in modes if mode in rules.rulesets}
+        unchecked_modes = [mode for mode in modes if mode not in rules.rulesets]
 
-    def _check_oath(self, build):
         violations = []
-        oath = build.oath if hasattr(build, 'oath') else None
-
-        if oath and oath != 'None':
-            # Remove brackets/parentheses for matching
-            base_oath = re.sub(r'\[.*?\]|\(.*?\)', '', oath).strip()
+        for category, item in self._build_items(build):
+            hits = rules.index[category].get(normalize(item))
+            if not hits:
+                continue
+            for mode, line in hits:
+                if mode in by_mode:
+                    by_mode[mode].append(line)
+                    if line not in violations:
+                        violations.append(line)
 
-            if base_oath in self.banned['oaths']:
-                violations.append(self.banned['oaths'][base_oath])
-
-        return violations
+        status = 'illegal' if violations else 'unchecked' if unchecked_modes else 'legal'
+        result = {
+            'is_legal': status == 'legal',
+            'status': status,
+            'violations': violations,
+            'by_mode': by_mode,
+            'unchecked_modes': unchecked_modes,
+            'modes': modes,
+            'ruleset_version': rules.version,
+            'ruleset_updated': rules.updated,
+        }
+        if fingerprint is not None:
+            self._results.set(key, result)
+        return result
 
     @staticmethod
     def report_embed(result):
         # Format modes for title
         title = 'DL Validation'
+        if result['modes'] != [DEFAULT_MODE]:
+            title += f" ({', '.join(mode.capitalize() for mode in result['modes'])})"
         color = discord.Color.blurple()  # Always blurple
-        
+
         # Description based on legality
-        description = 'Build is Legal' if result['is_legal'] else 'Some parts of the build is Illegal (Details Below)'
-        
+        status = result['status']
+        if status == 'illegal':
+            description = 'Some parts of the build is Illegal (Details Below)'
+        elif status == 'unchecked':
+            checked = ', '.join(mode.capitalize() for mode in result['by_mode'])
+            description = f"No violations in: {checked}" if checked else 'Build could not be checked'
+        else:
+            description = 'Build is Legal'
+        if result.get('unchecked_modes'):
+            description += "\nNot checked, no banned list is available for: " + ', '.join(
+                mode.capitalize() for mode in result['unchecked_modes']
+            )
+
         embed = discord.Embed(title=title, description=description, color=color)
         embed.url = "https://docs.google.com/document/d/1T-B9pGtGryf-wcrlFfx-kzb7EAB0ocXjvZEnTJdVcyc/edit?tab=t.0"
-        
-        if result['violations']:
+
+        by_mode = result.get('by_mode') or {DEFAULT_MODE: result['violations']}
+        for mode, violations in by_mode.items():
+            if not violations:
+                continue
             # Violations already include the full text with notes
+            name = f"Violations ({len(violations)} found)"
+            if len(result['modes']) > 1:
+                name = f"{mode.capitalize()} - {name}"
             embed.add_field(
-                name=f"Violations ({len(result['violations'])} found)",
-                value='\n'.join(f"{i+1}. {v}" for i, v in enumerate(result['violations'])),
+                name=name,
+                value='\n'.join(f"{i+1}. {v}" for i, v in enumerate(violations)),
                 inline=False
             )
-        
-        embed.set_footer(text="Updated Nov 8, 2025")
-        
-        return embed
\ No newline at end of file
+
+        footer = f"Ruleset {result.get('ruleset_version', 'unknown')}"
+        if result.get('ruleset_updated'):
+            updated = datetime.fromtimestamp(result['ruleset_updated'], timezone.utc)
+            footer += f" · Updated {updated:%b} {updated.day}, {updated.year}"
+        embed.set_footer(text=footer)
+
+        return embed
+
+
+# Global instance
+legality_checker = BuildLegalityChecker()
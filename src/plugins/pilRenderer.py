@@ -0,0 +1,287 @@
+"""
+Pillow renderers for the simple bar/line charts.
+
+These draw the same plain-data jobs as the matplotlib renderers in statEvo and
+ehpbreakdown, straight onto a PIL image with the bundled Helvetica Neue fonts.
+They skip matplotlib's import and layout cost entirely; pick them per chart
+type with CHART_RENDERER_<KIND>=pillow (see plugins.renderService).
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageColor, ImageFont
+
+from plugins.imageEncoder import encode, CHART_DPI_SCALE
+
+FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "helvetica-neue-5"
+FONT_FILES = {
+    'regular': "HelveticaNeueRoman.otf",
+    'medium': "HelveticaNeueMedium.otf",
+    'bold': "HelveticaNeueBold.otf",
+}
+
+TEXT_COLOR = "#262626"
+GRID_COLOR = "#cccccc"
+
+
+@lru_cache(maxsize=None)
+def font(weight, size):
+    try:
+        return ImageFont.truetype(str(FONTS_DIR / FONT_FILES[weight]), size)
+    except OSError:
+        print(f"Warning: Could not load Helvetica Neue {weight}, using the default font")
+        return ImageFont.load_default(size)
+
+
+def pt(points, dpi):
+    """Matplotlib point sizes to pixels at the chart's dpi."""
+    return max(1, round(points * dpi / 72))
+
+
+def rgba(color, alpha=None):
+    """RGBA tuple; like matplotlib, an explicit alpha replaces the colour's own."""
+    r, g, b, *a = ImageColor.getrgb(color)
+    if alpha is not None:
+        return (r, g, b, round(255 * alpha))
+    return (r, g, b, a[0] if a else 255)
+
+
+def over_white(color, alpha):
+    """Opaque colour that a translucent `color` shows as on the white background."""
+    r, g, b, a = rgba(color, alpha)
+    return tuple(round(c * a / 255 + 255 * (1 - a / 255)) for c in (r, g, b))
+
+
+def text_width(draw, text, fnt):
+    return draw.textlength(text, font=fnt)
+
+
+def nice_ticks(lo, hi, max_ticks=8):
+    """Round tick positions covering [lo, hi], like matplotlib's default locator."""
+    span = hi - lo
+    for step in (1, 2, 5, 10, 20, 25, 50, 100, 200, 250, 500, 1000):
+        if span / step <= max_ticks:
+            break
+    first = -(-lo // step) * step
+    return list(range(int(first), int(hi) + 1, step))
+
+
+class Plot:
+    """Data -> pixel transform for one axes rectangle."""
+
+    def __init__(self, box, xlim, ylim):
+        self.left, self.top, self.right, self.bottom = box
+        self.xlim = xlim
+        self.ylim = ylim
+
+    def x(self, v):
+        lo, hi = self.xlim
+        return self.left + (v - lo) / (hi - lo) * (self.right - self.left)
+
+    def y(self, v):
+        lo, hi = self.ylim
+        return self.bottom - (v - lo) / (hi - lo) * (self.bottom - self.top)
+
+
+def dashed_line(draw, p0, p1, fill, width, dash):
+    """Straight horizontal/vertical dashed line; dash is (on, off) in pixels."""
+    (x0, y0), (x1, y1) = p0, p1
+    length = max(abs(x1 - x0), abs(y1 - y0))
+    on, off = dash
+    pos = 0
+    while pos < length:
+        end = min(pos + on, length)
+        t0, t1 = pos / length, end / length
+        draw.line([(x0 + (x1 - x0) * t0, y0 + (y1 - y0) * t0),
+                   (x0 + (x1 - x0) * t1, y0 + (y1 - y0) * t1)], fill=fill, width=width)
+        pos += on + off
+
+
+def marker(draw, kind, x, y, size, fill):
+    r = size / 2
+    if kind == 'o':
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=fill)
+    elif kind == '^':
+        draw.regular_polygon((x, y, r * 1.15), 3, fill=fill)
+    else:
+        draw.rectangle([x - r * 0.85, y - r * 0.85, x + r * 0.85, y + r * 0.85], fill=fill)
+
+
+def legend(draw, entries, right, bottom, fnt, sample_w, row_h):
+    """Draw legend entries (draw_sample, label) stacked up from the bottom-right corner."""
+    width = sample_w + 8 + max(text_width(draw, label, fnt) for _, label in entries)
+    x = right - width
+    y = bottom - row_h * len(entries)
+    for draw_sample, label in entries:
+        cy = y + row_h / 2
+        draw_sample(x, cy, x + sample_w)
+        draw.text((x + sample_w + 8, cy), label, font=fnt, fill=TEXT_COLOR, anchor='lm')
+        y += row_h
+
+
+# ---------------------------------------------------------------- breakdown
+
+def _breakdown_panel(components, values, mag_values, ehp_val, width=800, height=380, dpi=100):
+    image = Image.new('RGBA', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    tick_font = font('regular', pt(9, dpi))
+    label_font = font('bold', pt(10, dpi))
+    value_font = font('bold', pt(9, dpi))
+    small_font = font('bold', pt(8, dpi))
+    legend_font = font('regular', pt(8, dpi))
+
+    label_w = max((text_width(draw, c, tick_font) for c in components), default=0)
+    n = len(components)
+    lo, hi = -0.16, n - 1 + 0.16
+    pad = (hi - lo) * 0.05
+    plot = Plot((int(label_w) + 16, 10, width - 20, height - 52), (0, 800), (lo - pad, hi + pad))
+
+    for tick in range(0, 801, 100):
+        x = plot.x(tick)
+        draw.line([(x, plot.top), (x, plot.bottom)], fill="#f4f4f4", width=1)
+        draw.text((x, plot.bottom + 6), str(tick), font=tick_font, fill=TEXT_COLOR, anchor='mt')
+    for i, name in enumerate(components):
+        y = plot.y(i)
+        draw.line([(plot.left, y), (plot.right, y)], fill=GRID_COLOR, width=1)
+        draw.text((plot.left - 6, y), name, font=tick_font, fill=TEXT_COLOR, anchor='rm')
+    draw.text(((plot.left + plot.right) / 2, height - 6), 'Health Contribution',
+              font=label_font, fill=TEXT_COLOR, anchor='mb')
+
+    half = 0.16
+    for i, value in enumerate(values):
+        draw.rectangle([plot.x(0), plot.y(i + half), plot.x(value), plot.y(i - half)],
+                       fill="#f42307", outline="#333333", width=1)
+
+    # EHP bars are translucent over the raw bars
+    overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+    odraw = ImageDraw.Draw(overlay)
+    for i, magv in enumerate(mag_values):
+        odraw.rectangle([plot.x(0), plot.y(i + half), plot.x(magv), plot.y(i - half)],
+                        fill=rgba('#3c5fa5', 0.24), outline=rgba("#333333", 0.24), width=1)
+    image.alpha_composite(overlay)
+    draw = ImageDraw.Draw(image)
+
+    final = "#837C8A"
+    if ehp_val:
+        x = plot.x(ehp_val)
+        dashed_line(draw, (x, plot.top), (x, plot.bottom), final, 2, (6, 3))
+
+    for i, (value, magv) in enumerate(zip(values, mag_values)):
+        y = plot.y(i)
+        draw.text((plot.x(value / 2), y), f'{value:.0f}', font=value_font, fill='white', anchor='mm')
+        if magv > value:
+            draw.text((plot.x(magv + 8), y), f'{magv:.0f}', font=small_font, fill='#205375', anchor='lm')
+
+    sample = pt(8, dpi) * 2
+    entries = [
+        (lambda x0, cy, x1: draw.rectangle([x0, cy - 5, x1, cy + 5], fill="#f42307", outline="#333333"), "Raw"),
+        (lambda x0, cy, x1: draw.rectangle([x0, cy - 5, x1, cy + 5], fill=over_white('#3c5fa5', 0.24), outline=over_white("#333333", 0.24)), "EHP w/ PEN/Resist"),
+    ]
+    if ehp_val:
+        entries.insert(0, (lambda x0, cy, x1: dashed_line(draw, (x0, cy), (x1, cy), final, 2, (6, 3)),
+                           f'Final EHP = {ehp_val:.0f}'))
+    legend(draw, entries, plot.right - 6, plot.bottom - 6, legend_font, sample, pt(8, dpi) + 6)
+    return image
+
+
+def render_breakdowns(job):
+    """Pillow version of ehpbreakdown.render_breakdowns."""
+    panels = [_breakdown_panel(*panel) for panel in job['panels']]
+    image = Image.new('RGBA', (800, 380 * len(panels)), 'white')
+    for i, panel in enumerate(panels):
+        image.paste(panel, (0, 380 * i))
+    return encode(image, scale=CHART_DPI_SCALE)
+
+
+# ---------------------------------------------------------------- stat evolution
+
+def render_statevo(job):
+    """Pillow version of statEvo.render_statevo."""
+    from plugins.statEvo import SERIES, COLOR_REINVEST, COLOR_REINVEST_GRAY, OFFSET, GAP, _layout
+
+    dpi = 144
+    categories = job['categories']
+    labels = job['labels']
+    y, height = _layout(len(categories), job['splits'])
+
+    width_px = pt(13 * 72, dpi)
+    height_px = pt((height * 0.1 + 5) * 72, dpi)
+    image = Image.new('RGBA', (width_px, height_px), 'white')
+    draw = ImageDraw.Draw(image)
+
+    tick_font = font('regular', pt(10, dpi))
+    cat_font = font('medium', pt(15, dpi))
+    value_font = font('bold', pt(13, dpi))
+    label_font = font('bold', pt(16, dpi))
+    legend_font = font('regular', pt(13, dpi))
+
+    tick_labels = [f"{cat} ({postval})" for cat, postval in zip(categories, job['post'])]
+    label_w = max((text_width(draw, t, cat_font) for t in tick_labels), default=0)
+    xmax = max(job['pre'] + job['ord'] + job['post'] + [0]) + 18
+    plot = Plot(
+        (int(label_w) + 30, 20, width_px - 20, height_px - pt(16, dpi) - pt(10, dpi) - 40),
+        (-8, xmax),
+        (min(y) - OFFSET - GAP*1.0, max(y) + OFFSET + GAP*1.5),
+    )
+
+    for tick in nice_ticks(0, xmax):
+        x = plot.x(tick)
+        draw.line([(x, plot.top), (x, plot.bottom)], fill="#f0f0f0", width=2)
+        draw.text((x, plot.bottom + 8), str(tick), font=tick_font, fill=TEXT_COLOR, anchor='mt')
+    for yy, text in zip(y, tick_labels):
+        draw.line([(plot.left, plot.y(yy)), (plot.right, plot.y(yy))], fill=GRID_COLOR, width=2)
+        draw.text((plot.left - 12, plot.y(yy)), text, font=cat_font, fill=TEXT_COLOR, anchor='rm')
+    for split_idx in job['splits']:
+        if split_idx < len(y):
+            sy = plot.y((y[split_idx-1] + y[split_idx]) / 2)
+            dashed_line(draw, (plot.left, sy), (plot.right, sy), "#BBBBBB", 4, (14, 6))
+    draw.text(((plot.left + plot.right) / 2, height_px - 10), labels['stat_value'],
+              font=label_font, fill=TEXT_COLOR, anchor='mb')
+
+    line_w = pt(2.3, dpi)
+    marker_size = pt(9, dpi)
+    x0 = plot.x(0)
+    for key, _, color, mark, offset, _ in SERIES:
+        for yy, val in zip(y, job[key]):
+            if val != 0:
+                py = plot.y(yy + offset)
+                draw.line([(x0, py), (plot.x(val), py)], fill=color, width=line_w)
+                marker(draw, mark, plot.x(val), py, marker_size, color)
+
+    # Reinvest intervals are translucent and sit over the lines, under the labels
+    overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
+    odraw = ImageDraw.Draw(overlay)
+    bar_half = pt(11, dpi) / 2
+    for highlighted, yy, ordv, postv in zip(job['highlight'], y, job['ord'], job['post']):
+        if ordv != postv:
+            lo, hi = sorted([ordv, postv])
+            shade = rgba(COLOR_REINVEST_GRAY if highlighted else COLOR_REINVEST, 0.92)
+            py = plot.y(yy)
+            odraw.rectangle([plot.x(lo) - bar_half, py - bar_half, plot.x(hi) + bar_half, py + bar_half], fill=shade)
+    image.alpha_composite(overlay)
+    draw = ImageDraw.Draw(image)
+
+    for key, _, color, _, offset, text_dx in SERIES:
+        for yy, val in zip(y, job[key]):
+            if val != 0:
+                draw.text((plot.x(val + text_dx), plot.y(yy + offset)), str(val),
+                          font=value_font, fill=color, anchor='lm')
+
+    def line_sample(color, mark):
+        def sample(x_start, cy, x_end):
+            draw.line([(x_start, cy), (x_end, cy)], fill=color, width=line_w)
+            marker(draw, mark, (x_start + x_end) / 2, cy, marker_size, color)
+        return sample
+
+    def band_sample(color):
+        def sample(x_start, cy, x_end):
+            draw.rectangle([x_start, cy - pt(4, dpi), x_end, cy + pt(4, dpi)], fill=over_white(color, 0.92))
+        return sample
+
+    entries = [(line_sample(color, mark), labels[label]) for _, label, color, mark, _, _ in SERIES]
+    entries += [
+        (band_sample(COLOR_REINVEST), labels['reinvest_interval']),
+        (band_sample(COLOR_REINVEST_GRAY), labels['reinvest_key_stat']),
+    ]
+    legend(draw, entries, plot.right - 10, plot.bottom - 10, legend_font, pt(26, dpi), pt(13, dpi) + 14)
+    return encode(image, scale=CHART_DPI_SCALE)
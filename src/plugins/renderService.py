@@ -0,0 +1,167 @@
+"""
+Chart rendering off the event loop.
+
+Matplotlib keeps global state, holds the GIL and takes hundreds of milliseconds
+per chart, so charts are rendered in a pool of pre-warmed worker processes.
+Callers hand over a plain-data job (lists, numbers, strings) and get encoded
+image bytes back. The number of queued + running jobs is bounded and every job
+has a timeout.
+
+Set RENDER_WORKERS=0 to render in the calling thread instead (e.g. for debugging).
+Each chart type can use a different backend: CHART_RENDERER_<KIND>=pillow
+(e.g. CHART_RENDERER_BREAKDOWN) swaps matplotlib for plugins.pilRenderer where
+a Pillow version exists.
+
+Workers are forked where the platform allows it, so call render_service.start()
+early, before the process starts other threads; with "spawn" each worker
+re-imports the main script, so keep its side effects under a __main__ guard.
+"""
+import os
+import time
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_MAX_PENDING = int(os.getenv("RENDER_MAX_PENDING", "16"))
+RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", "20"))
+RENDER_START_METHOD = os.getenv(
+    "RENDER_START_METHOD",
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn",
+)
+
+# kind -> backend -> (module, function); resolved inside the worker so jobs stay plain data
+RENDERERS = {
+    'statevo': {
+        'matplotlib': ('plugins.statEvo', 'render_statevo'),
+        'pillow': ('plugins.pilRenderer', 'render_statevo'),
+    },
+    'breakdown': {
+        'matplotlib': ('plugins.ehpbreakdown', 'render_breakdowns'),
+        'pillow': ('plugins.pilRenderer', 'render_breakdowns'),
+    },
+    'ehpcurve': {
+        'matplotlib': ('plugins.ehpCurve', 'render_ehp_curve'),
+    },
+}
+
+
+def _select_backend(kind):
+    backend = os.getenv(f"CHART_RENDERER_{kind.upper()}", "matplotlib").lower()
+    if backend not in RENDERERS[kind]:
+        print(f"Warning: No {backend} renderer for {kind} charts, using matplotlib")
+        backend = 'matplotlib'
+    return backend
+
+
+# kind -> backend chosen for this process
+CHART_RENDERER = {kind: _select_backend(kind) for kind in RENDERERS}
+
+
+class RenderQueueFull(Exception):
+    """Raised when too many render jobs are already queued."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within its timeout."""
+
+
+def _renderer(kind, backend=None):
+    module_name, func_name = RENDERERS[kind][backend or CHART_RENDERER[kind]]
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _init_worker():
+    # Pay the matplotlib/font/renderer import cost once per worker, not per chart;
+    # workers that only use Pillow renderers never import matplotlib
+    start = time.perf_counter()
+    if 'matplotlib' in CHART_RENDERER.values():
+        # font_manager first: it points matplotlib at the persistent font cache
+        from utils.font_manager import ensure_fonts
+        import matplotlib
+        matplotlib.use('Agg')
+        try:
+            matplotlib.set_loglevel("error")
+        except Exception:
+            pass
+        ensure_fonts()
+        import plugins.chartTemplates  # noqa: F401
+    for kind in RENDERERS:
+        _renderer(kind)
+    print(f"✓ Render worker {os.getpid()} ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def _ping():
+    return os.getpid()
+
+
+def _run_job(kind, job):
+    return _renderer(kind)(job)
+
+
+class RenderService:
+    def __init__(self, workers=RENDER_WORKERS, max_pending=RENDER_MAX_PENDING, timeout=RENDER_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Create the worker pool and pre-warm every worker. Safe to call repeatedly."""
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(RENDER_START_METHOD),
+                    initializer=_init_worker,
+                )
+                # Spawning is lazy; one ping per worker forces them all up and initialised
+                for _ in range(self.workers):
+                    self._executor.submit(_ping)
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, kind, job):
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown chart type: {kind}")
+        if not self._slots.acquire(blocking=False):
+            raise RenderQueueFull("Too many charts are being rendered right now, try again shortly.")
+        try:
+            try:
+                future = self.start().submit(_run_job, kind, job)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool once and retry
+                self.shutdown()
+                future = self.start().submit(_run_job, kind, job)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the worker is actually done, even if the caller timed out
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def render_sync(self, kind, job, timeout=None):
+        """Render a job and block until its image bytes are ready (for worker threads)."""
+        timeout = self.timeout if timeout is None else timeout
+        if self.workers <= 0:
+            return _run_job(kind, job)
+        future = self._submit(kind, job)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise RenderTimeout(f"Rendering {kind} took longer than {timeout:.0f}s") from None
+
+
+# Global instance
+render_service = RenderService()
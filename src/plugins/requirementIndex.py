@@ -0,0 +1,222 @@
+"""
+Stat requirement index for talents, weapons and mantras.
+
+Every item's base, weapon and attunement requirements are flattened into one
+row of an int matrix over SoO.STAT_COLUMNS, so checking any set of stat lines
+against any set of items is a single NumPy comparison, and "how far off" is a
+single subtraction. Each index is derived from the shared table snapshot and
+rebuilt only when that snapshot changes.
+"""
+import os
+
+import numpy as np
+
+import _HANDLERS as process
+from plugins.SoO import STAT_COLUMNS, order
+
+COLUMN = {stat: i for i, stat in enumerate(STAT_COLUMNS)}
+
+# Items this many points (summed over stats) or fewer away count as near misses
+NEAR_MISS_POINTS = int(os.getenv("NEAR_MISS_POINTS", "10"))
+
+# Requirement keys in the data tables are not spelled consistently
+# ("Heavy Wep.", "heavy", "HVY", "Flamecharm", "flame", ...)
+_ALIASES = {
+    'str': 'Strength', 'fort': 'Fortitude', 'for': 'Fortitude', 'agl': 'Agility', 'agi': 'Agility',
+    'int': 'Intelligence', 'will': 'Willpower', 'wll': 'Willpower', 'cha': 'Charisma', 'chr': 'Charisma',
+    'heavy': 'Heavy Wep.', 'hvy': 'Heavy Wep.', 'medium': 'Medium Wep.', 'med': 'Medium Wep.',
+    'light': 'Light Wep.', 'lht': 'Light Wep.',
+    'flame': 'Flamecharm', 'frost': 'Frostdraw', 'thunder': 'Thundercall', 'gale': 'Galebreathe',
+    'shadow': 'Shadowcast', 'iron': 'Ironsing', 'blood': 'Bloodrend',
+}
+_ALIASES.update({stat.lower(): stat for stat in STAT_COLUMNS})
+_ALIASES.update({stat.lower().rstrip('.'): stat for stat in STAT_COLUMNS})
+
+
+def stat_column(key):
+    """Column of a requirement key, or None if it is not a stat."""
+    if not isinstance(key, str):
+        return None
+    key = key.strip().lower().rstrip('.')
+    stat = _ALIASES.get(key) or _ALIASES.get(key.replace(' weapon', '').replace(' wep', ''))
+    return COLUMN.get(stat)
+
+
+class RequirementIndex:
+    """
+    names[i] needs at least matrix[i, c] in STAT_COLUMNS[c]. Requirement keys
+    that are not stats (power, oath, ...) are not something stats can change,
+    so they are left out; `ignored` counts them.
+    """
+
+    def __init__(self, items):
+        names, rows = [], []
+        self.ignored = 0
+        for name, requirements in items:
+            row = np.zeros(len(STAT_COLUMNS), dtype=np.int16)
+            for key, value in requirements:
+                column = stat_column(key)
+                try:
+                    value = int(value or 0)
+                except (TypeError, ValueError):
+                    column = None
+                if column is None:
+                    self.ignored += 1
+                    continue
+                row[column] = max(row[column], value)
+            names.append(name)
+            rows.append(row)
+        self.names = names
+        self.position = {name: i for i, name in enumerate(names)}
+        self.matrix = np.array(rows, dtype=np.int16).reshape(len(rows), len(STAT_COLUMNS))
+
+    def __len__(self):
+        return len(self.names)
+
+    def rows(self, names):
+        """Indexed names among `names`, and their row numbers."""
+        found = [name for name in names if name in self.position]
+        return found, np.fromiter((self.position[name] for name in found), dtype=np.intp, count=len(found))
+
+    def met(self, stat_lines, rows=None):
+        """
+        Boolean matrix: met[k, i] is True when stat line k (a sequence of
+        STAT_COLUMNS vectors) satisfies item rows[i] (default: every item).
+        """
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        lines = np.asarray(stat_lines, dtype=np.int16).reshape(-1, len(STAT_COLUMNS))
+        return (matrix[None, :, :] <= lines[:, None, :]).all(axis=2)
+
+
+    def missing(self, stats):
+        """Points short of each requirement, as an (items, STAT_COLUMNS) matrix."""
+        vector = np.asarray(stat_vector(stats), dtype=np.int16)
+        return np.maximum(self.matrix - vector, 0)
+
+    def unlocks(self, stats, near=10, near_points=NEAR_MISS_POINTS):
+        """
+        (qualified, near_misses) for a stat dict. qualified lists every item
+        with at least one stat requirement that `stats` meets, hardest first;
+        near_misses lists up to `near` items short by at most `near_points`
+        points in total, closest first, as (name, {stat: points short}).
+        """
+        if not len(self):
+            return [], []
+        short = self.missing(stats)
+        total = short.sum(axis=1, dtype=np.int32)
+        demanding = self.matrix.any(axis=1)
+
+        hit = np.flatnonzero((total == 0) & demanding)
+        hit = hit[np.argsort(-self.matrix[hit].sum(axis=1, dtype=np.int32), kind='stable')]
+        qualified = [self.names[i] for i in hit]
+
+        close = np.flatnonzero((total > 0) & (total <= near_points))
+        close = close[np.lexsort((close, total[close]))][:near]
+        near_misses = [
+            (self.names[i], {STAT_COLUMNS[c]: int(short[i, c]) for c in np.flatnonzero(short[i])})
+            for i in close
+        ]
+        return qualified, near_misses
+
+
+def stat_vector(stats):
+    """A stat dict (flatpre/flatpost/order output) as a STAT_COLUMNS vector."""
+    return [stats.get(stat, 0) for stat in STAT_COLUMNS]
+
+
+def _talent_items(rows):
+    for row in rows or []:
+        name = row.get('name')
+        data = row.get('data') if isinstance(row.get('data'), dict) else row
+        if name is None or not isinstance(data, dict):
+            continue
+        requirements = []
+        for field in ('base', 'weapons', 'attunements'):
+            section = data.get(field) or {}
+            if isinstance(section, dict):
+                requirements.extend(section.items())
+        yield name, requirements
+
+
+def build_talent_index(talent_rows):
+    """RequirementIndex over a talents snapshot. The first row wins on duplicate names."""
+    seen, items = set(), []
+    for name, requirements in _talent_items(talent_rows):
+        if name not in seen:
+            seen.add(name)
+            items.append((name, requirements))
+    return RequirementIndex(items)
+
+
+def talent_index():
+    return process.get_table_index('talents', build_talent_index)
+
+
+def _requirement_sections(reqs):
+    """(key, value) pairs of a {'base': {...}, 'weapon': {...}, 'attunement': {...}} block."""
+    requirements = []
+    for key, value in (reqs or {}).items() if isinstance(reqs, dict) else ():
+        if isinstance(value, dict):
+            requirements.extend(value.items())
+        elif stat_column(key) is not None:
+            requirements.append((key, value))
+    return requirements
+
+
+def _payload_items(rows, reqs_of):
+    seen = set()
+    for row in rows or []:
+        payload = row.get('data') if isinstance(row.get('data'), dict) else row
+        name = payload.get('name') or row.get('name')
+        if name is None or name in seen:
+            continue
+        seen.add(name)
+        yield name, _requirement_sections(reqs_of(payload))
+
+
+def build_weapon_index(weapon_rows):
+    """RequirementIndex over a weapons snapshot (details.reqs)."""
+    return RequirementIndex(_payload_items(weapon_rows, lambda p: (p.get('details') or {}).get('reqs')))
+
+
+def build_mantra_index(mantra_rows):
+    """RequirementIndex over a mantras snapshot (reqs)."""
+    return RequirementIndex(_payload_items(mantra_rows, lambda p: p.get('reqs')))
+
+
+# table name -> index builder, for every table /unlock searches
+ITEM_INDEXES = {
+    'talents': build_talent_index,
+    'weapons': build_weapon_index,
+    'mantras': build_mantra_index,
+}
+
+
+def unlocks(stats, near=10):
+    """{table: (qualified, near_misses)} for every indexed table; see RequirementIndex.unlocks."""
+    return {
+        table: process.get_table_index(table, builder).unlocks(stats, near)
+        for table, builder in ITEM_INDEXES.items()
+    }
+
+
+def shrine_talent_changes(build, ordered_stats=None, flatpre=None):
+    """
+    Which of the build's talents stop (lost) or start (gained) meeting their
+    requirements when the pre-shrine stats go through the Shrine of Order.
+    `flatpre` overrides the build's pre-shrine stats (e.g. a ShrineState's).
+    Returns (lost, gained) as sorted name lists.
+    """
+    if flatpre is None:
+        flatpre = build.flatpre
+    if ordered_stats is None:
+        ordered_stats = order(flatpre.copy(), {"Race": build.race, "PointsSpent": 0})
+
+    index = talent_index()
+    names, rows = index.rows(build.talents)
+    if not names:
+        return [], []
+    before, after = index.met([stat_vector(flatpre), stat_vector(ordered_stats)], rows)
+    lost = sorted(name for name, b, a in zip(names, before, after) if b and not a)
+    gained = sorted(name for name, b, a in zip(names, before, after) if a and not b)
+    return lost, gained
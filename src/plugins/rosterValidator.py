@@ -0,0 +1,162 @@
+"""
+Bulk legality checks for tournament rosters.
+
+Takes any text containing builder links (one per line, pasted lists, CSV
+exports...), loads the builds concurrently through the shared build cache and
+runs every one through the shared legality checker. Also usable from the
+command line, from src/:
+
+    python -m plugins.rosterValidator roster.txt [--mode wars --mode glads] [-o report.csv]
+"""
+import io
+import os
+import re
+import sys
+import csv
+import asyncio
+import argparse
+
+import discord
+
+import plugins._DWBAPIWRAPPER as dwb
+from plugins.legalityChecker import legality_checker, DEFAULT_MODE, MODES
+
+# Builds fetched at once; the builder API is shared with every other command
+ROSTER_CONCURRENCY = int(os.getenv("ROSTER_CONCURRENCY", "8"))
+# Links accepted per roster
+ROSTER_MAX_BUILDS = int(os.getenv("ROSTER_MAX_BUILDS", "200"))
+
+BUILD_LINK_PATTERN = re.compile(r'deepwoken\.co/builder\?id=([A-Za-z0-9_-]+)')
+
+
+def extract_build_ids(text):
+    """Builder ids in order of first appearance, without duplicates."""
+    return list(dict.fromkeys(BUILD_LINK_PATTERN.findall(text or '')))
+
+
+async def _validate_one(build_id, modes, semaphore):
+    row = {'build_id': build_id, 'link': f"https://deepwoken.co/builder?id={build_id}", 'name': '', 'error': None}
+    try:
+        async with semaphore:
+            build = await dwb.get_build_async(build_id)
+    except Exception as exc:
+        row['error'] = str(exc) or exc.__class__.__name__
+        return row
+    row['name'] = build.name
+    # Dict lookups only, and usually a cache hit for repeat entries
+    row['result'] = legality_checker.check_build(build, modes)
+    return row
+
+
+async def validate_roster(build_ids, modes=None, concurrency=ROSTER_CONCURRENCY):
+    """
+    Validate every build id. Returns one row per id, in input order: build_id,
+    link, name, and either 'result' (a check_build result) or 'error'.
+    """
+    modes = modes or [DEFAULT_MODE]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return await asyncio.gather(*(_validate_one(build_id, modes, semaphore) for build_id in build_ids))
+
+
+def summarize(rows):
+    """(legal, illegal, unchecked, failed) counts; unchecked builds had no violations but a mode without a ruleset."""
+    statuses = [row['result']['status'] for row in rows if row.get('result')]
+    legal, illegal, unchecked = (statuses.count(status) for status in ('legal', 'illegal', 'unchecked'))
+    return legal, illegal, unchecked, len(rows) - len(statuses)
+
+
+def roster_csv(rows, modes=None):
+    """The full report as CSV text: one line per build, one violations column per mode."""
+    modes = modes or [DEFAULT_MODE]
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(['build_id', 'link', 'name', 'status'] + [f"{mode}_violations" for mode in modes] + ['error'])
+    for row in rows:
+        result = row.get('result')
+        if result is None:
+            writer.writerow([row['build_id'], row['link'], row['name'], 'error'] + [''] * len(modes) + [row['error']])
+            continue
+        by_mode = result.get('by_mode', {})
+        writer.writerow(
+            [row['build_id'], row['link'], row['name'], result['status']]
+            + ['; '.join(by_mode[mode]) if mode in by_mode else 'unchecked' for mode in modes]
+            + ['']
+        )
+    return buf.getvalue()
+
+
+def roster_report(rows, modes=None):
+    """(embed, file) summarizing a validate_roster run, with the CSV attached."""
+    modes = modes or [DEFAULT_MODE]
+    legal, illegal, unchecked, failed = summarize(rows)
+
+    description = f"**{len(rows)}** builds: **{legal}** legal, **{illegal}** illegal"
+    if unchecked:
+        description += f", **{unchecked}** unchecked"
+    description += f", **{failed}** could not be loaded"
+    unchecked_modes = next((row['result']['unchecked_modes'] for row in rows if row.get('result')), [])
+    if unchecked_modes:
+        description += "\nNot checked, no banned list is available for: " + ', '.join(
+            mode.capitalize() for mode in unchecked_modes
+        )
+    embed = discord.Embed(
+        title=f"DL Roster Validation ({', '.join(mode.capitalize() for mode in modes)})",
+        description=description,
+        color=discord.Color.blurple()
+    )
+
+    def listing(lines):
+        value = '\n'.join(lines)
+        if len(value) > 1024:
+            value = value[:1000].rsplit('\n', 1)[0] + "\n… (see CSV)"
+        return value
+
+    illegal_lines = [
+        f"[{row['name'] or row['build_id']}]({row['link']}): {len(row['result']['violations'])} violation(s)"
+        for row in rows if row.get('result') and row['result']['status'] == 'illegal'
+    ]
+    if illegal_lines:
+        embed.add_field(name="Illegal Builds", value=listing(illegal_lines), inline=False)
+    failed_lines = [f"`{row['build_id']}`: {row['error'][:80]}" for row in rows if row.get('result') is None]
+    if failed_lines:
+        embed.add_field(name="Failed to Load", value=listing(failed_lines), inline=False)
+
+    version = next((row['result']['ruleset_version'] for row in rows if row.get('result')), legality_checker.version)
+    embed.set_footer(text=f"Ruleset {version}")
+
+    file = discord.File(io.BytesIO(roster_csv(rows, modes).encode('utf-8')), filename="roster_validation.csv")
+    return embed, file
+
+
+async def _main(args):
+    with open(args.roster, 'r', encoding='utf-8') as f:
+        build_ids = extract_build_ids(f.read())
+    modes = args.mode or [DEFAULT_MODE]
+    try:
+        rows = await validate_roster(build_ids, modes, args.concurrency)
+    finally:
+        await dwb.close_session()
+
+    report = roster_csv(rows, modes)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(report)
+    else:
+        print(report, end='')
+    legal, illegal, unchecked, failed = summarize(rows)
+    print(f"{len(rows)} builds: {legal} legal, {illegal} illegal, {unchecked} unchecked, {failed} failed "
+          f"(ruleset {legality_checker.version})",
+          file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('roster', help="text file containing builder links")
+    parser.add_argument('--mode', action='append', choices=MODES, help="ruleset to check (repeatable, default wars)")
+    parser.add_argument('-o', '--output', help="write the CSV here instead of stdout")
+    parser.add_argument('-c', '--concurrency', type=int, default=ROSTER_CONCURRENCY)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
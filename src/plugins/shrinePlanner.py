@@ -0,0 +1,191 @@
+"""
+Shrine of Order planner: search pre-shrine allocations whose order() result
+meets given post-shrine targets (e.g. talent requirements that must survive
+the shrine) without pushing any stat past where the final build wants it.
+
+The search works on the shape of order()'s result instead of trying pre-shrine
+values one by one. After the shrine every invested stat that is not capped sits
+at one shared level; a capped stat keeps exactly its pre-shrine value minus
+MAXIMUM_REDUCTION. So a plan is fixed by (invested stats, level, which stats
+are capped and where), and within one shape the pre-shrine values follow
+directly. Shapes that cannot meet a target, would overshoot a cap, or cannot
+beat the plans already found are pruned, and every surviving plan is checked
+against order() itself before it is returned.
+"""
+import time
+import itertools
+from collections import namedtuple
+
+from plugins.SoO import order, racial_stats, attunements, STAT_COLUMNS, MAXIMUM_REDUCTION, MAXIMUM_STAT
+
+# pre/post are full stat dicts; spent is pre-shrine points (racial points excluded);
+# kept is how many of them land in stats that still want them after the shrine
+ShrinePlan = namedtuple('ShrinePlan', ['pre', 'post', 'spent', 'kept', 'level'])
+
+# Default search time per request, in seconds
+PLAN_TIME_BUDGET = 2.0
+
+
+def _spread(lows, highs, total):
+    """Share `total` over slots within [low, high], as evenly as the bounds allow."""
+    values = list(lows)
+    total -= sum(values)
+    while total > 0:
+        open_slots = [i for i, v in enumerate(values) if v < highs[i]]
+        if not open_slots:
+            return None
+        low = min(values[i] for i in open_slots)
+        for i in open_slots:
+            if total and values[i] == low:
+                values[i] += 1
+                total -= 1
+    return values
+
+
+def plan_shrine(race, budget, targets=None, caps=None, pre_min=None, stats=STAT_COLUMNS,
+                limit=5, time_budget=PLAN_TIME_BUDGET):
+    """
+    Best pre-shrine allocations for `race` spending at most `budget` points.
+
+    targets  {stat: minimum value after the shrine}
+    caps     {stat: value the final build wants}; going past it is wasted. Stats
+             missing from caps are not invested (default: every stat up to 100)
+    pre_min  {stat: minimum value before the shrine}, e.g. pre-shrine talent requirements
+    stats    stat names of the returned dicts, in order
+
+    Plans are ranked by points kept, then by fewest invested stats. Returns at
+    most `limit` ShrinePlans; fewer (or none) if the time budget runs out or
+    the targets cannot be met.
+    """
+    targets = targets or {}
+    pre_min = pre_min or {}
+    deadline = time.perf_counter() + time_budget
+    racial = racial_stats[race]
+    base = {s: racial.get(s, 0) for s in stats}
+    if caps is None:
+        caps = dict.fromkeys(stats, MAXIMUM_STAT)
+    # Stats left out of caps are not wanted after the shrine at all
+    cap = {s: max(caps.get(s, base[s]), targets.get(s, 0)) for s in stats}
+    target = {s: targets.get(s, 0) for s in stats}
+    # Lowest pre-shrine value that still counts as invested
+    low = {s: max(base[s] + 1, pre_min.get(s, 0)) for s in stats}
+
+    required = [s for s in stats if target[s] > base[s] or pre_min.get(s, 0) > base[s]]
+    optional = [s for s in stats if s not in required and cap[s] > base[s]]
+
+    plans = {}
+
+    def worst_kept():
+        if len(plans) < limit:
+            return -1
+        return min(plan.kept for plan in plans.values())
+
+    def consider(invested, level, capped, uncapped_points, capped_posts):
+        pre = dict(base)
+        for s, q in capped_posts.items():
+            pre[s] = q + MAXIMUM_REDUCTION
+        uncapped = [s for s in invested if s not in capped_posts]
+        values = _spread([low[s] - base[s] for s in uncapped],
+                         [min(MAXIMUM_STAT, level + MAXIMUM_REDUCTION) - base[s] for s in uncapped],
+                         uncapped_points)
+        if values is None:
+            return
+        for s, v in zip(uncapped, values):
+            pre[s] = base[s] + v
+
+        post = order(dict(pre), {"Race": race, "PointsSpent": 0})
+        if any(post[s] < target[s] for s in stats):
+            return
+        spent = sum(pre[s] - base[s] for s in stats)
+        if spent > budget:
+            return
+        kept = sum(min(post[s], cap[s]) - base[s] for s in invested)
+        key = tuple(post[s] for s in stats)
+        previous = plans.get(key)
+        candidate = ShrinePlan(pre, post, spent, kept, level)
+        if previous is None or (spent, tuple(pre.values())) < (previous.spent, tuple(previous.pre.values())):
+            plans[key] = candidate
+        if len(plans) > limit:
+            del plans[min(plans, key=lambda k: (plans[k].kept, -len_invested(plans[k])))]
+
+    def len_invested(plan):
+        return sum(1 for s in stats if plan.pre[s] != base[s])
+
+    # Fewest invested stats first; each extra stat only matters if it keeps more points
+    for extra in range(len(optional) + 1):
+        for chosen in itertools.combinations(optional, extra):
+            if time.perf_counter() > deadline:
+                return _ranked(plans, len_invested)
+            invested = required + list(chosen)
+            if not invested:
+                continue
+
+            # Every invested stat ends at the level or above it, so the level can't pass any cap
+            top = min(min(cap[s] for s in invested), MAXIMUM_STAT)
+            bottom = max([1] + [target[s] for s in invested if s in attunements])
+            for level in range(top, bottom - 1, -1):
+                # Best case: every stat at its cap, within the budget
+                if min(budget, sum(cap[s] - base[s] for s in invested)) <= worst_kept():
+                    break
+                forced, free, blocked = [], [], False
+                for s in invested:
+                    can_cap = s not in attunements and max(level + 1, target[s]) <= min(cap[s], MAXIMUM_STAT - MAXIMUM_REDUCTION)
+                    must_cap = target[s] > level or low[s] > level + MAXIMUM_REDUCTION
+                    if must_cap and not can_cap:
+                        blocked = True
+                        break
+                    if must_cap:
+                        forced.append(s)
+                    elif can_cap:
+                        free.append(s)
+                if blocked:
+                    continue
+
+                for n_free in range(len(free) + 1):
+                    for extra_capped in itertools.combinations(free, n_free):
+                        capped = forced + list(extra_capped)
+                        uncapped = [s for s in invested if s not in capped]
+                        if not uncapped:
+                            continue
+                        # Points the uncapped stats must hold so that the level lands exactly
+                        uncapped_points = len(uncapped) * level - sum(MAXIMUM_REDUCTION - base[s] for s in capped)
+                        if uncapped_points < sum(low[s] - base[s] for s in uncapped):
+                            continue
+                        q_low = [max(level + 1, target[s], low[s] - MAXIMUM_REDUCTION) for s in capped]
+                        q_high = [min(cap[s], MAXIMUM_STAT - MAXIMUM_REDUCTION) for s in capped]
+                        spend_fixed = uncapped_points + sum(MAXIMUM_REDUCTION - base[s] for s in capped)
+                        room = budget - spend_fixed
+                        if room < sum(q_low):
+                            continue
+                        best_kept = len(uncapped) * level + min(room, sum(q_high)) - sum(base[s] for s in invested)
+                        if best_kept <= worst_kept():
+                            continue
+                        posts = _spread(q_low, q_high, min(room, sum(q_high)))
+                        if posts is None:
+                            continue
+                        consider(invested, level, capped, uncapped_points, dict(zip(capped, posts)))
+
+    return _ranked(plans, len_invested)
+
+
+def _ranked(plans, len_invested):
+    return sorted(plans.values(), key=lambda p: (-p.kept, len_invested(p), -p.level))
+
+
+def parse_targets(text, stats=STAT_COLUMNS):
+    """
+    Parse "Fortitude 40, heavy 60" into {stat: value}. Stat names are matched
+    case-insensitively and may be shortened to any unambiguous prefix.
+    Raises ValueError with a user-facing message on bad input.
+    """
+    targets = {}
+    for part in filter(None, (p.strip() for p in (text or '').replace(';', ',').split(','))):
+        name, _, value = part.replace('=', ' ').replace(':', ' ').rpartition(' ')
+        name = name.strip().lower()
+        if not name or not value.isdigit():
+            raise ValueError(f"Could not read `{part}`; use `Stat value`, e.g. `Fortitude 40`.")
+        matches = [s for s in stats if s.lower() == name] or [s for s in stats if s.lower().startswith(name)]
+        if len(matches) != 1:
+            raise ValueError(f"Unknown or ambiguous stat `{name}`.")
+        targets[matches[0]] = int(value)
+    return targets
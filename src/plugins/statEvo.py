@@ -1,38 +1,33 @@
 from plugins.SoO import order
+from plugins.chartCache import chart_cache, chart_key
 import io
 
-def statevograph(build, guild_id=None):
-    # Lazy import matplotlib - only loads when actually generating graphs (~70MB RAM saved on startup)
-    import matplotlib
-    matplotlib.use('Agg')  # Headless backend - saves ~5-10MB RAM
-    import matplotlib.pyplot as plt
-    from matplotlib.lines import Line2D
-    from utils.language_manager import language_manager
-    try:
-        from utils.font_manager import _fonts_registered  # side-effect: registers fonts if present
-    except Exception:
-        pass  # Continue with matplotlib's bundled fonts
-    
-    playerStats = {"Race": build.race, "PointsSpent": 0}
-    flatpre = build.flatpre
-    flatpost = build.flatpost
-    ordered_stats = order(build.flatpre.copy(), playerStats)
+BASE_STATS = {
+    "Strength", "Fortitude", "Agility", "Intelligence", "Willpower", "Charisma"
+}
+WEAPON_STATS = {"Medium Wep.", "Light Wep.", "Heavy Wep."}
+ATTUNEMENT_STATS = {
+    "Frostdraw", "Flamecharm", "Shadowcast", "Galebreathe", "Thundercall", "Bloodrend", "Ironsing"
+}
+# Correct: use set union
+HIGHLIGHT_STATS = ATTUNEMENT_STATS | WEAPON_STATS | {"Fortitude"}
 
-    base_stats = {
-        "Strength", "Fortitude", "Agility", "Intelligence", "Willpower", "Charisma"
-    }
-    weapon_stats = {"Medium Wep.", "Light Wep.", "Heavy Wep."}
-    attunement_stats = {
-        "Frostdraw", "Flamecharm", "Shadowcast", "Galebreathe", "Thundercall", "Bloodrend", "Ironsing"
-    }
 
-    # Correct: use set union
-    highlight_stats = attunement_stats | weapon_stats | {"Fortitude"}
+def statevo_job(build, guild_id=None, ordered_stats=None, flatpre=None):
+    """Plain-data description of the stat evolution chart for the render service."""
+    from utils.language_manager import language_manager
+
+    if flatpre is None:
+        flatpre = build.flatpre
+    flatpost = build.flatpost
+    if ordered_stats is None:
+        playerStats = {"Race": build.race, "PointsSpent": 0}
+        ordered_stats = order(flatpre.copy(), playerStats)
 
     all_stats = []
-    all_stats += [stat for stat in base_stats if stat in flatpre]
-    all_stats += [stat for stat in weapon_stats if stat in flatpre]
-    all_stats += [stat for stat in attunement_stats if stat in flatpre]
+    all_stats += [stat for stat in BASE_STATS if stat in flatpre]
+    all_stats += [stat for stat in WEAPON_STATS if stat in flatpre]
+    all_stats += [stat for stat in ATTUNEMENT_STATS if stat in flatpre]
     others = [k for k in flatpre.keys() if k not in all_stats]
     all_stats += others
 
@@ -43,101 +38,157 @@ def statevograph(build, guild_id=None):
 
     splits = []
     idx = 0
-    for group in [base_stats, weapon_stats, attunement_stats]:
+    for group in [BASE_STATS, WEAPON_STATS, ATTUNEMENT_STATS]:
         n = len([s for s in group if s in categories])
         if n:
             idx += n
             splits.append(idx)
-    splits = splits[:-1] 
+    splits = splits[:-1]
+
+    return {
+        'categories': categories,
+        'highlight': [key in HIGHLIGHT_STATS for key in categories],
+        'splits': splits,
+        'pre': [flatpre[key] for key in categories],
+        'ord': [ordered_stats[key] for key in categories],
+        'post': [flatpost[key] for key in categories],
+        'labels': {
+            'stat_value': language_manager.get_text(guild_id, 'stat_value'),
+            'pre_shrine': language_manager.get_text(guild_id, 'pre_shrine'),
+            'order': language_manager.get_text(guild_id, 'order'),
+            'post_shrine': language_manager.get_text(guild_id, 'post_shrine'),
+            'reinvest_interval': language_manager.get_text(guild_id, 'reinvest_interval'),
+            'reinvest_key_stat': language_manager.get_text(guild_id, 'reinvest_key_stat'),
+        },
+    }
 
-    gap = 12   
-    block_gap = 22  
+
+OFFSET = 2.5
+# (job key, legend label key, colour, marker, y offset, value label x offset)
+SERIES = (
+    ('pre', 'pre_shrine', "#DC143C", 'o', -OFFSET, 1.5),
+    ('ord', 'order', "#444444", '^', 0, 2.5),
+    ('post', 'post_shrine', "#13282B", 's', OFFSET, 3.4),
+)
+COLOR_REINVEST = "#297ec3cc"
+COLOR_REINVEST_GRAY = "#9D9D9D88"
+LINE_WIDTH = 2.3
+GAP = 12
+BLOCK_GAP = 22
+
+# Use a robust default font to ensure consistent sizing/layout across systems.
+# Keep translations intact; only font family is adjusted for readability.
+_style = None
+
+
+def _statevo_style():
+    global _style
+    if _style is None:
+        from plugins.chartTemplates import chart_style
+        _style = chart_style(**{
+            'font.family': 'DejaVu Sans',
+            'axes.edgecolor': 'gray',
+            'axes.linewidth': 0.7
+        })
+    return _style
+
+
+def _layout(n, splits):
     y = []
     current_y = 0
-    y_pos = {}
-    for i, cat in enumerate(categories):
+    for i in range(n):
         y.append(current_y)
-        y_pos[cat] = current_y
         if i+1 in splits:
-            current_y += block_gap
+            current_y += BLOCK_GAP
         else:
-            current_y += gap
-
-    pre_values = [flatpre[key] for key in categories]
-    ord_values = [ordered_stats[key] for key in categories]
-    post_values = [flatpost[key] for key in categories]
-
-    plt.style.use('seaborn-v0_8-whitegrid')
-    # Use a robust default font to ensure consistent sizing/layout across systems.
-    # Keep translations intact; only font family is adjusted for readability.
-    plt.rcParams.update({
-        'font.family': 'DejaVu Sans',
-        'axes.edgecolor': 'gray',
-        'axes.linewidth': 0.7
-    })
-
-    plt.figure(figsize=(13, current_y*0.1 + 5))
-    color_pre = "#DC143C"
-    color_ord = "#444444"
-    color_post = "#13282B"
-    color_reinvest = "#297ec3cc"
-    color_reinvest_gray = "#9D9D9D88"
-    offset = 2.5
-    lw = 2.3
-
-    ys_pre  = [yy - offset for yy in y]
-    ys_ord  = y
-    ys_post = [yy + offset for yy in y]
-
-    new_categories = [
-        f"{cat} ({postval})" for cat, postval in zip(categories, post_values)
-    ]
+            current_y += GAP
+    return y, current_y
 
-    plt.grid(axis='x', alpha=0.19, linewidth=1.1)
-
-    for yy, val in zip(ys_pre, pre_values):
-        if val != 0:
-            plt.hlines(yy, 0, val, color=color_pre, linewidth=lw)
-            plt.plot(val, yy, 'o', color=color_pre, markersize=9, markeredgewidth=1.5)
-            plt.text(val + 1.5, yy, str(val), va='center', ha='left', color=color_pre, fontsize=13, weight='semibold')
-    for yy, val in zip(ys_ord, ord_values):
-        if val != 0:
-            plt.hlines(yy, 0, val, color=color_ord, linewidth=lw)
-            plt.plot(val, yy, '^', color=color_ord, markersize=9, markeredgewidth=1.5)
-            plt.text(val + 2.5, yy, str(val), va='center', ha='left', color=color_ord, fontsize=13, weight='semibold')
-    for yy, val in zip(ys_post, post_values):
-        if val != 0:
-            plt.hlines(yy, 0, val, color=color_post, linewidth=lw)
-            plt.plot(val, yy, 's', color=color_post, markersize=9, markeredgewidth=1.5)
-            plt.text(val + 3.4, yy, str(val), va='center', ha='left', color=color_post, fontsize=13, weight='semibold')
-
-    for key, yy, ordv, postv in zip(categories, ys_ord, ord_values, post_values):
-        if ordv != postv:
-            x0, x1 = sorted([ordv, postv])
-            shade = color_reinvest_gray if key in highlight_stats else color_reinvest
-            plt.plot([x0, x1], [yy, yy], color=shade, linewidth=11, alpha=0.92, solid_capstyle='projecting')
-
-    for split_idx in splits:
-        if split_idx < len(y):
-            plt.axhline((y[split_idx-1]+y[split_idx])/2, color="#AAAAAA", lw=2, linestyle="--", alpha=0.8, zorder=0)
-
-    plt.yticks(y, new_categories, fontsize=15, fontweight='medium')
-    plt.ylim(min(ys_pre)-gap*1.0, max(ys_post)+gap*1.5)
-    plt.xlabel(language_manager.get_text(guild_id, 'stat_value'), fontsize=16, fontweight='semibold', labelpad=8)
-    plt.xlim(-8, max(pre_values+ord_values+post_values) + 18)
-
-    handles = [
-        Line2D([0], [0], color=color_pre, marker='o', linestyle='-', linewidth=lw, markersize=9, label=language_manager.get_text(guild_id, 'pre_shrine')),
-        Line2D([0], [0], color=color_ord, marker='^', linestyle='-', linewidth=lw, markersize=9, label=language_manager.get_text(guild_id, 'order')),
-        Line2D([0], [0], color=color_post, marker='s', linestyle='-', linewidth=lw, markersize=9, label=language_manager.get_text(guild_id, 'post_shrine')),
-        Line2D([0], [0], color=color_reinvest,  linestyle='-', linewidth=8, alpha=0.92, label=language_manager.get_text(guild_id, 'reinvest_interval')),
-        Line2D([0], [0], color=color_reinvest_gray, linestyle='-', linewidth=8, alpha=0.92, label=language_manager.get_text(guild_id, 'reinvest_key_stat')),
-    ]
-    plt.legend(handles=handles, loc='lower right', frameon=False, fontsize=13, ncol=1)
-    plt.tight_layout(pad=2)
-    plt.box(False)
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=144)
-    buf.seek(0)
-    plt.close()
-    return buf
+
+def _statevo_template(y, height, splits, labels):
+    """Figure, grid, split lines, axis label and legend for one layout/language."""
+    from matplotlib.lines import Line2D
+    from plugins.chartTemplates import FigureTemplate
+
+    template = FigureTemplate(_statevo_style(), figsize=(13, height*0.1 + 5), dpi=144)
+    with template.style():
+        ax = template.axes[0]
+        ax.grid(axis='x', alpha=0.19, linewidth=1.1)
+
+        for split_idx in splits:
+            if split_idx < len(y):
+                ax.axhline((y[split_idx-1]+y[split_idx])/2, color="#AAAAAA", lw=2, linestyle="--", alpha=0.8, zorder=0)
+
+        ax.set_ylim(min(y) - OFFSET - GAP*1.0, max(y) + OFFSET + GAP*1.5)
+        ax.set_xlabel(labels['stat_value'], fontsize=16, fontweight='semibold', labelpad=8)
+
+        handles = [
+            Line2D([0], [0], color=color, marker=marker, linestyle='-', linewidth=LINE_WIDTH, markersize=9, label=labels[label])
+            for _, label, color, marker, _, _ in SERIES
+        ]
+        handles += [
+            Line2D([0], [0], color=COLOR_REINVEST, linestyle='-', linewidth=8, alpha=0.92, label=labels['reinvest_interval']),
+            Line2D([0], [0], color=COLOR_REINVEST_GRAY, linestyle='-', linewidth=8, alpha=0.92, label=labels['reinvest_key_stat']),
+        ]
+        ax.legend(handles=handles, loc='lower right', frameon=False, fontsize=13, ncol=1)
+        ax.set_frame_on(False)
+    return template
+
+
+def render_statevo(job):
+    """Draw a statevo_job() and return the encoded image. Runs inside a render worker."""
+    from plugins.chartTemplates import get_template
+
+    categories = job['categories']
+    splits = job['splits']
+    labels = job['labels']
+    y, height = _layout(len(categories), splits)
+
+    key = ('statevo', tuple(y), tuple(splits), tuple(sorted(labels.items())))
+    template = get_template(key, lambda: _statevo_template(y, height, splits, labels))
+
+    with template, template.style():
+        ax = template.axes[0]
+        for key, _, color, marker, offset, text_dx in SERIES:
+            points = [(yy + offset, val) for yy, val in zip(y, job[key]) if val != 0]
+            if not points:
+                continue
+            ys, vals = zip(*points)
+            template.track(ax.hlines(ys, 0, vals, color=color, linewidth=LINE_WIDTH))
+            template.track(ax.plot(vals, ys, marker, color=color, markersize=9, markeredgewidth=1.5)[0])
+            for yy, val in points:
+                template.track(ax.text(val + text_dx, yy, str(val), va='center', ha='left', color=color, fontsize=13, weight='semibold'))
+
+        reinvest = [
+            (yy, *sorted([ordv, postv]), COLOR_REINVEST_GRAY if highlighted else COLOR_REINVEST)
+            for highlighted, yy, ordv, postv in zip(job['highlight'], y, job['ord'], job['post'])
+            if ordv != postv
+        ]
+        if reinvest:
+            ys, x0s, x1s, shades = zip(*reinvest)
+            template.track(ax.hlines(ys, x0s, x1s, colors=shades, linewidth=11, alpha=0.92, capstyle='projecting'))
+
+        ax.set_yticks(y, [f"{cat} ({postval})" for cat, postval in zip(categories, job['post'])],
+                      fontsize=15, fontweight='medium')
+        ax.set_xlim(-8, max(job['pre'] + job['ord'] + job['post']) + 18)
+
+        template.layout(pad=2)
+        return template.encode()
+
+
+def statevograph(build, guild_id=None, state=None):
+    """
+    Stat evolution chart for a build. `state` is an optional SoO.ShrineState
+    holding what-if edits to the pre-shrine stats; its cached order is used.
+    """
+    from utils.language_manager import language_manager
+
+    if state is None:
+        key = chart_key('statevo', build.fingerprint, language_manager.get_language(guild_id))
+        return io.BytesIO(chart_cache.render(key, 'statevo', lambda: statevo_job(build, guild_id)))
+
+    changes = sorted(state.changes().items())
+    key = chart_key('statevo', build.fingerprint, language_manager.get_language(guild_id), changes)
+    return io.BytesIO(chart_cache.render(
+        key, 'statevo', lambda: statevo_job(build, guild_id, ordered_stats=state.result(), flatpre=state.stats)
+    ))
@@ -0,0 +1,54 @@
+from collections import namedtuple
+
+# Per-talent numbers used by health/summary/EHP calculations, flattened out of
+# the nested talents table rows so lookups are a single dict access by name.
+TalentStats = namedtuple('TalentStats', [
+    'health',
+    'posture',
+    'ether',
+    'carry_load',
+    'passive_agility',
+    'stats',        # frozenset of stat keys with a non-zero value in data['stats']
+    'attunements',  # frozenset of attunements with a non-zero value in data['attunements']
+])
+
+EMPTY_TALENT = TalentStats(0, 0, 0, 0, 0, frozenset(), frozenset())
+
+
+def _talent_stats(row):
+    data = row.get('data') or {}
+    stats = data.get('stats') or {}
+    attunements = data.get('attunements') or {}
+    return TalentStats(
+        health=stats.get('health', 0),
+        posture=stats.get('posture', 0),
+        ether=stats.get('ether', 0),
+        carry_load=stats.get('carry load', 0),
+        passive_agility=stats.get('passive agility', 0),
+        stats=frozenset(k for k, v in stats.items() if v != 0),
+        attunements=frozenset(k for k, v in attunements.items() if v != 0),
+    )
+
+
+def build_talent_table(talent_rows):
+    """Index talents table rows by name. The first row wins on duplicate names."""
+    table = {}
+    for row in talent_rows or []:
+        name = row.get('name')
+        if name is not None and name not in table:
+            table[name] = _talent_stats(row)
+    return table
+
+
+# (rows, table) for the last talents snapshot; holding the rows keeps the identity check honest
+_snapshot = (None, {})
+
+
+def get_talent_table(talent_rows):
+    """Return the table for this talents snapshot, building it only when the snapshot changes."""
+    global _snapshot
+    rows, table = _snapshot
+    if rows is not talent_rows:
+        table = build_talent_table(talent_rows)
+        _snapshot = (talent_rows, table)
+    return table
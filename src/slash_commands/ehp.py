@@ -1,17 +1,18 @@
 """
 /ehp slash command - Calculate Effective Health Points for a Deepwoken build
 """
+import asyncio
 import discord
 from typing import Optional
-import io
-from PIL import Image
 
-from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
 from .shared import dispatch_command_result
 import plugins._DWBAPIWRAPPER as dwb
 from _HANDLERS.dataManager import searchTableByName
-from plugins.ehpbreakdown import plot_breakdown
-from plugins.kitTools import calculate_kit_stats
+from plugins.ehpbreakdown import plot_breakdowns
+from plugins.imageEncoder import chart_filename
+from plugins.ehpEngine import PHYS_KIT, HP_KIT
+from plugins.kitTools import kit_totals
 from utils.language_manager import language_manager
 
 
@@ -33,7 +34,7 @@ async def execute(interaction: discord.Interaction, kit_id: Optional[str] = None
     build_id = extract_build_id(final_build_link)
     
     try:
-        build = dwb.dwbBuild(build_id)
+        build = await load_build(interaction, build_id)
     except Exception as exc:
         error_embed = discord.Embed(
             title="Build Load Failed",
@@ -49,7 +50,7 @@ async def execute(interaction: discord.Interaction, kit_id: Optional[str] = None
         # If a kit is provided, compute totals (HP and Physical armor) and render a single chart
         if kit_id:
             kit_id_clean = kit_id.strip()
-            kit_data = searchTableByName('kits', kit_id_clean, 'kit_share_id')
+            kit_data = await asyncio.to_thread(searchTableByName, 'kits', kit_id_clean, 'kit_share_id')
             if not kit_data:
                 title = language_manager.get_text(guild_id, 'kit_not_found')
                 description = language_manager.get_text(guild_id, 'kit_not_found_description').format(kit_id=kit_id_clean)
@@ -57,7 +58,7 @@ async def execute(interaction: discord.Interaction, kit_id: Optional[str] = None
                 await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
                 return
 
-            # Aggregate kit totals with calculate_kit_stats, supporting possible shapes
+            # Aggregate kit totals with kit_totals, supporting possible shapes
             items = None
             # Common shapes observed in repo
             for key_path in (
@@ -75,24 +76,15 @@ async def execute(interaction: discord.Interaction, kit_id: Optional[str] = None
                 except Exception:
                     continue
 
-            total_health = 0
-            total_phys = 0
-            if items:
-                for item in items:
-                    stats = calculate_kit_stats(item)
-                    total_health += stats.get('Health', 0)
-                    total_phys += stats.get('Physical armor', 0)
+            totals = kit_totals(items)
+            total_health = totals.get('Health', 0)
+            total_phys = totals.get('Physical armor', 0)
 
-            buf = plot_breakdown(build, talentBase=dwb.talentBase, params={
+            buf = await asyncio.to_thread(plot_breakdowns, build, dwb.talent_base(), [{
                 'dps': 100, 'pen': 50, 'kithp': total_health, 'kitresis': total_phys
-            })
+            }])
 
-            img = Image.open(buf)
-            output_buf = io.BytesIO()
-            img.save(output_buf, format="PNG")
-            output_buf.seek(0)
-
-            file = discord.File(fp=output_buf, filename="kit_breakdown.png")
+            file = discord.File(fp=buf, filename=chart_filename("kit_breakdown"))
 
             title = language_manager.get_text(guild_id, 'ehp_breakdown_title_single').format(name=build.name)
             subtitle = f" (Kit: +{total_health} HP, +{total_phys}% Phys Armor)" if (total_health or total_phys) else ""
@@ -100,41 +92,24 @@ async def execute(interaction: discord.Interaction, kit_id: Optional[str] = None
                 title=title + subtitle,
                 color=discord.Color.blurple()
             )
-            embed.set_image(url="attachment://kit_breakdown.png")
+            embed.set_image(url=f"attachment://{file.filename}")
 
             if not interaction.response.is_done():
                 await interaction.response.defer(thinking=False, ephemeral=False)
             await interaction.followup.send(embed=embed, file=file, ephemeral=False)
             return
 
-        # Default: two combined charts (Phys kit defaults and HP kit defaults)
-        params_phys = {'dps': 100, 'pen': 50, 'kithp': 112, 'kitresis': 33}
-        params_hp = {'dps': 100, 'pen': 50, 'kithp': 154, 'kitresis': 4}
-
-        buf1 = plot_breakdown(build, talentBase=dwb.talentBase, params=params_phys)
-        buf2 = plot_breakdown(build, talentBase=dwb.talentBase, params=params_hp)
-
-        img1 = Image.open(buf1)
-        img2 = Image.open(buf2)
-
-        total_height = img1.height + img2.height
-        max_width = max(img1.width, img2.width)
-        combined = Image.new("RGBA", (max_width, total_height), (255, 255, 255, 0))
-        combined.paste(img1, (0, 0))
-        combined.paste(img2, (0, img1.height))
-
-        output_buf = io.BytesIO()
-        combined.save(output_buf, format="PNG")
-        output_buf.seek(0)
+        # Default: Phys kit (top) and HP kit (bottom) panels rendered as one figure
+        buf = await asyncio.to_thread(plot_breakdowns, build, dwb.talent_base(), [PHYS_KIT, HP_KIT])
 
-        file = discord.File(fp=output_buf, filename="kit_breakdown.png")
+        file = discord.File(fp=buf, filename=chart_filename("kit_breakdown"))
 
         title = language_manager.get_text(guild_id, 'ehp_breakdown_title').format(name=build.name)
         embed = discord.Embed(
             title=title,
             color=discord.Color.blurple()
         )
-        embed.set_image(url="attachment://kit_breakdown.png")
+        embed.set_image(url=f"attachment://{file.filename}")
 
         if not interaction.response.is_done():
             await interaction.response.defer(thinking=False, ephemeral=False)
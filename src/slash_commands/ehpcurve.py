@@ -0,0 +1,55 @@
+"""
+/ehpcurve slash command - Plot EHP against enemy penetration for a Deepwoken build
+"""
+import asyncio
+import discord
+from typing import Optional
+
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
+from .shared import dispatch_command_result
+import interactions.ehpcurve as ehpcurve_interaction
+
+
+async def execute(interaction: discord.Interaction, build_link: Optional[str] = None):
+    """Execute the /ehpcurve command."""
+    if not interaction.response.is_done():
+        try:
+            await interaction.response.defer(thinking=True, ephemeral=False)
+        except Exception:
+            pass
+
+    # Try to get build link from parameter or replied message
+    final_build_link = await get_build_link_from_reply(interaction, build_link)
+
+    if not final_build_link:
+        await send_missing_link_error(interaction, "ehpcurve")
+        return
+
+    build_id = extract_build_id(final_build_link)
+
+    try:
+        build = await load_build(interaction, build_id)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Build Load Failed",
+            description=f"Could not load build from the provided link. Make sure it's a valid Deepwoken builder URL.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+
+    try:
+        guild_id = interaction.guild.id if interaction.guild else None
+        # Runs in a thread: the chart itself renders in the render worker pool
+        embed, file = await asyncio.to_thread(ehpcurve_interaction.execute, build, guild_id)
+
+        if not interaction.response.is_done():
+            await interaction.response.defer(thinking=False, ephemeral=False)
+        await interaction.followup.send(embed=embed, file=file, ephemeral=False)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="EHP Curve Failed",
+            description=f"An error occurred while calculating the EHP curve.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
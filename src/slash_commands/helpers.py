@@ -1,9 +1,11 @@
 """
 Helper utilities for slash commands
 """
+import asyncio
 import discord
 from typing import Optional
 from .shared import dispatch_command_result
+import plugins._DWBAPIWRAPPER as dwb
 
 
 def extract_build_id(build_link: str) -> str:
@@ -13,6 +15,19 @@ def extract_build_id(build_link: str) -> str:
     return build_link.strip()
 
 
+async def load_build(interaction: discord.Interaction, build_id: str, *, force_refresh: bool = False):
+    """
+    Fetch and parse a build without blocking the event loop.
+
+    The fetch is abandoned once the interaction token expires, since no
+    followup could be delivered after that anyway.
+    """
+    remaining = (interaction.expires_at - discord.utils.utcnow()).total_seconds()
+    if remaining <= 0:
+        raise asyncio.TimeoutError("Interaction expired before the build was loaded")
+    return await asyncio.wait_for(dwb.get_build_async(build_id, force_refresh=force_refresh), timeout=remaining)
+
+
 async def get_build_link_from_reply(interaction: discord.Interaction, build_link: Optional[str]) -> Optional[str]:
     """
     Get build link from either the command parameter or the message being replied to.
@@ -0,0 +1,130 @@
+"""
+/shrine slash command - What-if Shrine of Order simulator for a Deepwoken build
+"""
+import asyncio
+import discord
+from typing import Optional
+
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
+from .shared import dispatch_command_result
+from plugins.SoO import ShrineState
+from utils.language_manager import language_manager
+import interactions.shrine as shrine_interaction
+
+# Buttons stop responding after this many seconds without a click
+VIEW_TIMEOUT = 300
+STEPS = (-5, -1, 1, 5)
+
+
+class ShrineView(discord.ui.View):
+    """Stat picker plus +/- buttons; every click re-runs the shrine on the cached state."""
+
+    def __init__(self, owner_id: int, build, guild_id=None):
+        super().__init__(timeout=VIEW_TIMEOUT)
+        self.owner_id = owner_id
+        self.build = build
+        self.guild_id = guild_id
+        self.state = ShrineState(build.flatpre, build.race)
+        self.message = None
+        self._lock = asyncio.Lock()
+
+        # Select menus hold at most 25 options; a flat stat dict has 16
+        stats = list(build.flatpre)[:25]
+        self.selected = next((stat for stat in stats if build.flatpre[stat] > 0), stats[0])
+        self.select = discord.ui.Select(
+            placeholder=language_manager.get_text(guild_id, 'shrine_select_stat'),
+            options=[discord.SelectOption(label=stat, value=stat, default=(stat == self.selected)) for stat in stats],
+            row=0,
+        )
+        self.select.callback = self._on_select
+        self.add_item(self.select)
+
+        for step in STEPS:
+            button = discord.ui.Button(label=f"{step:+d}", style=discord.ButtonStyle.secondary, row=1)
+            button.callback = self._make_step(step)
+            self.add_item(button)
+
+        reset = discord.ui.Button(
+            label=language_manager.get_text(guild_id, 'shrine_reset'), style=discord.ButtonStyle.danger, row=1
+        )
+        reset.callback = self._on_reset
+        self.add_item(reset)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id == self.owner_id:
+            return True
+        await interaction.response.send_message("Only the person who ran `/shrine` can use these buttons.", ephemeral=True)
+        return False
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    async def _on_select(self, interaction: discord.Interaction):
+        self.selected = self.select.values[0]
+        for option in self.select.options:
+            option.default = option.value == self.selected
+        await interaction.response.edit_message(view=self)
+
+    def _make_step(self, step):
+        async def callback(interaction: discord.Interaction):
+            await self._update(interaction, lambda: self.state.adjust(self.selected, step))
+        return callback
+
+    async def _on_reset(self, interaction: discord.Interaction):
+        await self._update(interaction, self.state.reset)
+
+    async def _update(self, interaction: discord.Interaction, change):
+        async with self._lock:
+            change()
+            embed, file = await asyncio.to_thread(shrine_interaction.execute, self.build, self.guild_id, self.state)
+            await interaction.response.edit_message(embed=embed, attachments=[file], view=self)
+
+
+async def execute(interaction: discord.Interaction, build_link: Optional[str] = None):
+    """Execute the /shrine command."""
+    if not interaction.response.is_done():
+        try:
+            await interaction.response.defer(thinking=True, ephemeral=False)
+        except Exception:
+            pass
+
+    # Try to get build link from parameter or replied message
+    final_build_link = await get_build_link_from_reply(interaction, build_link)
+
+    if not final_build_link:
+        await send_missing_link_error(interaction, "shrine")
+        return
+
+    build_id = extract_build_id(final_build_link)
+
+    try:
+        build = await load_build(interaction, build_id)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Build Load Failed",
+            description=f"Could not load build from the provided link. Make sure it's a valid Deepwoken builder URL.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+
+    try:
+        view = ShrineView(interaction.user.id, build)
+        embed, file = await asyncio.to_thread(shrine_interaction.execute, build, None, view.state)
+
+        if not interaction.response.is_done():
+            await interaction.response.defer(thinking=False, ephemeral=False)
+        view.message = await interaction.followup.send(embed=embed, file=file, view=view, ephemeral=False, wait=True)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Shrine Simulation Failed",
+            description=f"An error occurred while simulating the shrine.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
@@ -0,0 +1,60 @@
+"""
+/shrineplan slash command - Find pre-shrine allocations that meet post-shrine targets
+"""
+import asyncio
+import discord
+from typing import Optional
+
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
+from .shared import dispatch_command_result
+from plugins.shrinePlanner import parse_targets
+import interactions.shrineplan as shrineplan_interaction
+
+
+async def execute(interaction: discord.Interaction, targets: Optional[str] = None,
+                  budget: Optional[int] = None, build_link: Optional[str] = None):
+    """Execute the /shrineplan command."""
+    if not interaction.response.is_done():
+        try:
+            await interaction.response.defer(thinking=True, ephemeral=False)
+        except Exception:
+            pass
+
+    try:
+        parsed_targets = parse_targets(targets)
+    except ValueError as exc:
+        error_embed = discord.Embed(title="Invalid Targets", description=str(exc), color=0xED4245)
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+
+    # Try to get build link from parameter or replied message
+    final_build_link = await get_build_link_from_reply(interaction, build_link)
+
+    if not final_build_link:
+        await send_missing_link_error(interaction, "shrineplan")
+        return
+
+    build_id = extract_build_id(final_build_link)
+
+    try:
+        build = await load_build(interaction, build_id)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Build Load Failed",
+            description=f"Could not load build from the provided link. Make sure it's a valid Deepwoken builder URL.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+
+    try:
+        # The search is CPU-bound but time-boxed (PLAN_TIME_BUDGET)
+        embed = await asyncio.to_thread(shrineplan_interaction.execute, build, None, parsed_targets, budget)
+        await dispatch_command_result(interaction, embed)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Shrine Plan Failed",
+            description=f"An error occurred while searching for a shrine plan.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
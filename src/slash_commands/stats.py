@@ -1,12 +1,12 @@
 """
 /stats slash command - Display build stats for a Deepwoken build
 """
+import asyncio
 import discord
 from typing import Optional
 
-from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
 from .shared import dispatch_command_result
-import plugins._DWBAPIWRAPPER as dwb
 import interactions.stats as stats_interaction
 
 
@@ -28,7 +28,7 @@ async def execute(interaction: discord.Interaction, build_link: Optional[str] =
     build_id = extract_build_id(final_build_link)
     
     try:
-        build = dwb.dwbBuild(build_id)
+        build = await load_build(interaction, build_id)
     except Exception as exc:
         error_embed = discord.Embed(
             title="Build Load Failed",
@@ -39,7 +39,8 @@ async def execute(interaction: discord.Interaction, build_link: Optional[str] =
         return
 
     try:
-        embed, file = stats_interaction.execute(build, None)
+        # Runs in a thread: the chart itself renders in the render worker pool
+        embed, file = await asyncio.to_thread(stats_interaction.execute, build, None)
         
         if not interaction.response.is_done():
             await interaction.response.defer(thinking=False, ephemeral=False)
@@ -4,13 +4,13 @@
 import discord
 from typing import Optional
 
-from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error
+from .helpers import extract_build_id, get_build_link_from_reply, send_missing_link_error, load_build
 from .shared import dispatch_command_result
-import plugins._DWBAPIWRAPPER as dwb
 import interactions.validate as validate_interaction
+from plugins.legalityChecker import MODES
 
 
-async def execute(interaction: discord.Interaction, build_link: Optional[str] = None):
+async def execute(interaction: discord.Interaction, build_link: Optional[str] = None, mode: Optional[str] = None):
     """Execute the /validate command."""
     if not interaction.response.is_done():
         try:
@@ -28,7 +28,7 @@ async def execute(interaction: discord.Interaction, build_link: Optional[str] =
     build_id = extract_build_id(final_build_link)
     
     try:
-        build = dwb.dwbBuild(build_id)
+        build = await load_build(interaction, build_id)
     except Exception as exc:
         error_embed = discord.Embed(
             title="Build Load Failed",
@@ -39,7 +39,8 @@ async def execute(interaction: discord.Interaction, build_link: Optional[str] =
         return
 
     try:
-        embed = validate_interaction.execute(build, None)
+        modes = list(MODES) if mode == 'all' else [mode] if mode else None
+        embed = validate_interaction.execute(build, None, modes)
         
         if not interaction.response.is_done():
             await interaction.response.defer(thinking=False, ephemeral=False)
@@ -0,0 +1,71 @@
+"""
+/validate_roster slash command - Validate every build in a roster at once
+"""
+import discord
+from typing import Optional
+
+from .shared import dispatch_command_result
+from plugins.legalityChecker import MODES
+from plugins.rosterValidator import extract_build_ids, validate_roster, roster_report, ROSTER_MAX_BUILDS
+
+# Largest roster attachment read, in bytes
+MAX_ROSTER_BYTES = 256 * 1024
+
+
+async def execute(interaction: discord.Interaction, roster: Optional[discord.Attachment] = None,
+                  links: Optional[str] = None, mode: Optional[str] = None):
+    """Execute the /validate_roster command."""
+    if not interaction.response.is_done():
+        try:
+            await interaction.response.defer(thinking=True, ephemeral=False)
+        except Exception:
+            pass
+
+    text = links or ''
+    if roster is not None:
+        if roster.size > MAX_ROSTER_BYTES:
+            error_embed = discord.Embed(
+                title="Roster Too Large",
+                description=f"The roster file must be under {MAX_ROSTER_BYTES // 1024} KB.",
+                color=0xED4245,
+            )
+            await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+            return
+        text += '\n' + (await roster.read()).decode('utf-8', errors='replace')
+
+    build_ids = extract_build_ids(text)
+    if not build_ids:
+        error_embed = discord.Embed(
+            title="No Build Links Found",
+            description=(
+                "Attach a text file with one Deepwoken builder link per line, or paste the links "
+                "into the `links` option."
+            ),
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+    if len(build_ids) > ROSTER_MAX_BUILDS:
+        error_embed = discord.Embed(
+            title="Roster Too Large",
+            description=f"Found {len(build_ids)} builds; at most {ROSTER_MAX_BUILDS} can be validated at once.",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
+        return
+
+    try:
+        modes = list(MODES) if mode == 'all' else [mode] if mode else None
+        rows = await validate_roster(build_ids, modes)
+        embed, file = roster_report(rows, modes)
+
+        if not interaction.response.is_done():
+            await interaction.response.defer(thinking=False, ephemeral=False)
+        await interaction.followup.send(embed=embed, file=file, ephemeral=False)
+    except Exception as exc:
+        error_embed = discord.Embed(
+            title="Roster Validation Failed",
+            description=f"An error occurred while validating the roster.\n\nError: {exc}",
+            color=0xED4245,
+        )
+        await dispatch_command_result(interaction, error_embed, ephemeral_override=True)
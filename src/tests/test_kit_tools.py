@@ -0,0 +1,95 @@
+"""
+kitTools.kit_totals against the per-stat summation it replaced, on random kits
+that include unknown slots, rarities, stats and innate types. Run from the
+repository root or src/:
+
+    python -m pytest src/tests
+"""
+import random
+
+import pytest
+
+from plugins.kitTools import PIP_DATA, STAT_ORDER, SLOT_ORDER, RARITY_ORDER, kit_totals, calculate_kit_stats
+
+SLOTS = SLOT_ORDER + ['Back', '']
+RARITIES = RARITY_ORDER + ['mythic']
+PIP_STATS = STAT_ORDER + ['Speed']
+INNATE_TYPES = ['Hp', 'none', 'Ether', 'Physical armor', 'Elemental armor', 'Posture', 'Speed', None]
+
+
+def legacy_calculate_kit_stats(item):
+    """kitTools.calculate_kit_stats as it was before the compiled pip vectors, kept verbatim for comparison."""
+    stats = {}
+    slot = item.get('slot', '')
+
+    for i in range(1, 5):
+        innate = item.get(f'innate_{i}', {})
+        if innate.get('type') == 'none':
+            continue
+        stat_type = 'Health' if innate.get('type') == 'Hp' else innate.get('type')
+        stats[stat_type] = stats.get(stat_type, 0) + innate.get('stat', 0)
+
+    if item.get('stars', 0) == 3 and slot in PIP_DATA['star_hp_bonus']:
+        stats['Health'] = stats.get('Health', 0) + PIP_DATA['star_hp_bonus'][slot]
+
+    pip_values = PIP_DATA['pip_values']
+    for rarity, selections in item.get('pipSelections', {}).items():
+        for stat_type in selections:
+            if stat_type in pip_values and slot in pip_values[stat_type]:
+                if rarity in pip_values[stat_type][slot]:
+                    stats[stat_type] = stats.get(stat_type, 0) + pip_values[stat_type][slot][rarity]
+
+            if stat_type == 'Sanity' and rarity in PIP_DATA['sanity_ether_bonus']:
+                stats['Ether'] = stats.get('Ether', 0) + PIP_DATA['sanity_ether_bonus'][rarity]
+
+    return stats
+
+
+def legacy_kit_totals(items):
+    """Per-item legacy stats summed stat by stat, zero stats left out like kit_totals."""
+    totals = {}
+    for item in items:
+        for stat, value in legacy_calculate_kit_stats(item).items():
+            totals[stat] = totals.get(stat, 0) + value
+    return {stat: value for stat, value in totals.items() if value}
+
+
+def random_item(rng):
+    item = {'slot': rng.choice(SLOTS), 'stars': rng.randint(0, 3)}
+    for i in range(1, 5):
+        if rng.random() < 0.8:
+            item[f'innate_{i}'] = {'type': rng.choice(INNATE_TYPES), 'stat': rng.randint(0, 12)}
+    if rng.random() < 0.9:
+        item['pipSelections'] = {
+            rarity: [rng.choice(PIP_STATS) for _ in range(rng.randint(0, 4))]
+            for rarity in rng.sample(RARITIES, rng.randint(0, len(RARITIES)))
+        }
+    return item
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_kit_totals_matches_legacy_sum(seed):
+    rng = random.Random(seed)
+    for _ in range(400):
+        kit = [random_item(rng) for _ in range(rng.randint(0, 9))]
+        assert kit_totals(kit) == legacy_kit_totals(kit), kit
+
+
+def test_calculate_kit_stats_matches_legacy_per_item():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        item = random_item(rng)
+        assert calculate_kit_stats(item) == legacy_kit_totals([item]), item
+
+
+def test_missing_pips_and_empty_kit():
+    assert kit_totals([]) == {}
+    assert kit_totals(None) == {}
+    assert kit_totals([{'slot': 'Head'}]) == {}
+    assert kit_totals([{'slot': 'Head', 'pipSelections': None, 'stars': 3}]) == {'Health': PIP_DATA['star_hp_bonus']['Head']}
+
+
+def test_sanity_pip_on_unknown_slot_still_gives_ether():
+    rarity = RARITY_ORDER[-1]
+    item = {'slot': 'Back', 'pipSelections': {rarity: ['Sanity']}}
+    assert kit_totals([item]) == {'Ether': PIP_DATA['sanity_ether_bonus'][rarity]}
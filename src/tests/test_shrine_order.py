@@ -0,0 +1,67 @@
+"""
+SoO.order, SoO.order_batch and SoO.ShrineState against the original
+pass-by-pass Shrine of Order, on random builds covering every race. The legacy
+implementation and corpus come from benchmarks.shrine_order, which also times
+them. Run from the repository root or src/:
+
+    python -m pytest src/tests
+"""
+import random
+
+import pytest
+
+from benchmarks.shrine_order import legacy_order, random_build
+from plugins import SoO
+from plugins.SoO import ShrineState, order_batch, stats_matrix, race_indices, racial_stats, STAT_COLUMNS
+
+SEEDS = range(5)
+BUILDS_PER_SEED = 400
+
+
+def corpus(seed, builds=BUILDS_PER_SEED):
+    rng = random.Random(seed)
+    return [random_build(rng) for _ in range(builds)]
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_order_matches_legacy(seed):
+    for race, stats in corpus(seed):
+        old_player, new_player = {"Race": race, "PointsSpent": 0}, {"Race": race, "PointsSpent": 0}
+        old = legacy_order(stats.copy(), old_player)
+        new = SoO.order(stats.copy(), new_player)
+        assert new == old, (race, stats)
+        assert new_player == old_player, (race, stats)
+        assert [type(v) for v in new.values()] == [type(v) for v in old.values()], (race, stats)
+
+
+def test_order_covers_every_race():
+    races = {race for seed in SEEDS for race, _ in corpus(seed)}
+    assert races == set(racial_stats)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_order_batch_matches_order(seed):
+    builds = corpus(seed)
+    batch = order_batch(stats_matrix(stats for _, stats in builds), race_indices(race for race, _ in builds))
+    for row, (race, stats) in zip(batch, builds):
+        expected = legacy_order(stats.copy(), {"Race": race, "PointsSpent": 0})
+        assert row.tolist() == [expected[stat] for stat in STAT_COLUMNS], (race, stats)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_shrine_state_adjust_matches_order(seed):
+    rng = random.Random(seed)
+    for race, stats in corpus(seed, builds=50):
+        state = ShrineState(stats, race)
+        assert state.result() == legacy_order(stats.copy(), {"Race": race, "PointsSpent": 0})
+        for _ in range(40):
+            stat = rng.choice(list(stats))
+            before = state.stats[stat]
+            applied = state.adjust(stat, rng.choice((-25, -5, -1, 1, 5, 25)))
+            low, high = state.bounds(stat)
+            assert state.stats[stat] == before + applied
+            assert low <= state.stats[stat] <= high
+            assert state.result() == legacy_order(dict(state.stats), {"Race": race, "PointsSpent": 0}), (race, state.stats)
+        state.reset()
+        assert state.changes() == {}
+        assert state.result() == legacy_order(stats.copy(), {"Race": race, "PointsSpent": 0})
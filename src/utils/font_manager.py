@@ -1,39 +1,71 @@
-import matplotlib.font_manager as fm
+import os
+import sys
+import time
+import threading
 from pathlib import Path
 
+FONTS_DIR = Path(__file__).parent.parent.parent / "assets" / "helvetica-neue-5"
+FAMILY = "Helvetica Neue"
 
-def register_helvetica_neue():
-    # Get path to fonts directory
-    base_dir = Path(__file__).parent.parent.parent  # Go up to repo root
-    fonts_dir = base_dir / "assets" / "helvetica-neue-5"
-    
-    if not fonts_dir.exists():
-        print(f"Warning: Helvetica Neue fonts directory not found at {fonts_dir}")
+# Only the weights the matplotlib charts draw with (regular ticks/legends, bold labels)
+CHART_FONT_WEIGHTS = ("Roman", "Bold")
+
+# Keep matplotlib's font list cache somewhere that survives restarts (e.g. a
+# mounted volume in containers); otherwise it is rebuilt on every boot. This
+# only works if set before matplotlib is first imported, so bot.py imports this
+# module before any plugin.
+FONT_CACHE_DIR = os.getenv("FONT_CACHE_DIR")
+if FONT_CACHE_DIR:
+    if "matplotlib" in sys.modules and os.environ.get("MPLCONFIGDIR") != FONT_CACHE_DIR:
+        print(f"Warning: matplotlib was imported before utils.font_manager, FONT_CACHE_DIR={FONT_CACHE_DIR} is ignored")
+    os.makedirs(FONT_CACHE_DIR, exist_ok=True)
+    os.environ.setdefault("MPLCONFIGDIR", FONT_CACHE_DIR)
+
+_fonts_registered = None
+_lock = threading.Lock()
+
+
+def register_helvetica_neue(weights=CHART_FONT_WEIGHTS):
+    start = time.perf_counter()
+    import matplotlib
+    import matplotlib.font_manager as fm
+    cache_ms = (time.perf_counter() - start) * 1000
+
+    if not FONTS_DIR.exists():
+        print(f"Warning: Helvetica Neue fonts directory not found at {FONTS_DIR}")
         return False
-    
-    # Register all .otf and .ttf files
+
     registered_count = 0
-    for font_file in fonts_dir.glob("*.otf"):
+    for weight in weights:
+        matches = sorted(FONTS_DIR.glob(f"HelveticaNeue{weight}.*"))
+        if not matches:
+            print(f"Warning: No Helvetica Neue {weight} font file in {FONTS_DIR}")
+            continue
         try:
-            fm.fontManager.addfont(str(font_file))
+            fm.fontManager.addfont(str(matches[0]))
             registered_count += 1
         except Exception as e:
-            print(f"Warning: Could not register font {font_file.name}: {e}")
-    
-    for font_file in fonts_dir.glob("*.ttf"):
-        try:
-            fm.fontManager.addfont(str(font_file))
-            registered_count += 1
-        except Exception as e:
-            print(f"Warning: Could not register font {font_file.name}: {e}")
-    
-    if registered_count > 0:
-        print(f"✓ Registered {registered_count} Helvetica Neue font(s)")
-        return True
-    else:
+            print(f"Warning: Could not register font {matches[0].name}: {e}")
+
+    if registered_count == 0:
         print("Warning: No Helvetica Neue fonts were registered")
         return False
 
+    # Resolve the lookups now so the first chart doesn't pay for them
+    for weight in ('normal', 'bold'):
+        fm.findfont(fm.FontProperties(family=FAMILY, weight=weight), fallback_to_default=True)
+
+    total_ms = (time.perf_counter() - start) * 1000
+    print(f"✓ Registered {registered_count} Helvetica Neue font(s) in {total_ms:.0f} ms "
+          f"(matplotlib font cache {cache_ms:.0f} ms, {matplotlib.get_cachedir()})")
+    return True
+
 
-# global instance
-_fonts_registered = register_helvetica_neue()
+def ensure_fonts():
+    """Register the chart fonts with matplotlib once per process; later calls are free."""
+    global _fonts_registered
+    if _fonts_registered is None:
+        with _lock:
+            if _fonts_registered is None:
+                _fonts_registered = register_helvetica_neue()
+    return _fonts_registered
@@ -280,11 +280,96 @@ TRANSLATIONS = {
         'es': 'Desglose de EHP Físico — {name}'
     },
     
+    'ehp_curve_title': {
+        'en': 'EHP vs Penetration — {name}',
+        'es': 'EHP vs Penetración — {name}'
+    },
+    'phys_kit': {
+        'en': 'Phys Kit',
+        'es': 'Kit Físico'
+    },
+    'hp_kit': {
+        'en': 'HP Kit',
+        'es': 'Kit HP'
+    },
+    
     # Stats Interaction
     'stat_evolution_title': {
         'en': 'Stat Evolution',
         'es': 'Evolución de Stats'
     },
+    'talents_lost_after_shrine': {
+        'en': 'Talents lost after the shrine',
+        'es': 'Talentos perdidos tras el shrine'
+    },
+    'talents_gained_after_shrine': {
+        'en': 'Talents unlocked by the shrine',
+        'es': 'Talentos desbloqueados por el shrine'
+    },
+    'unlock_title': {
+        'en': 'Stat Requirements Met',
+        'es': 'Requisitos de Stats Cumplidos'
+    },
+    'unlock_description': {
+        'en': 'Items with stat requirements that the final build meets (hardest first), and the closest ones it misses. Full list attached.',
+        'es': 'Objetos con requisitos de stats que la build final cumple (los más exigentes primero) y los más cercanos que no cumple. Lista completa adjunta.'
+    },
+    'unlock_talents': {
+        'en': 'Talents',
+        'es': 'Talentos'
+    },
+    'unlock_weapons': {
+        'en': 'Weapons',
+        'es': 'Armas'
+    },
+    'unlock_mantras': {
+        'en': 'Mantras',
+        'es': 'Mantras'
+    },
+    'unlock_near': {
+        'en': '{kind} almost unlocked',
+        'es': '{kind} casi desbloqueados'
+    },
+    'shrine_title': {
+        'en': 'Shrine of Order Simulator',
+        'es': 'Simulador de Shrine of Order'
+    },
+    'shrine_instructions': {
+        'en': 'Pick a stat, then move points in or out of it to see the new order.',
+        'es': 'Elige un stat y mueve puntos dentro o fuera de él para ver el nuevo order.'
+    },
+    'shrine_no_changes': {
+        'en': 'No changes from the original build.',
+        'es': 'Sin cambios respecto a la build original.'
+    },
+    'shrine_changes': {
+        'en': 'Changes',
+        'es': 'Cambios'
+    },
+    'shrine_select_stat': {
+        'en': 'Stat to adjust',
+        'es': 'Stat a ajustar'
+    },
+    'shrine_reset': {
+        'en': 'Reset',
+        'es': 'Reiniciar'
+    },
+    'shrineplan_title': {
+        'en': 'Shrine of Order Plan',
+        'es': 'Plan de Shrine of Order'
+    },
+    'shrineplan_summary': {
+        'en': 'Pre-shrine allocations spending up to **{budget}** points that keep **{targets}** after the shrine, without going past the final build.',
+        'es': 'Distribuciones pre-shrine con hasta **{budget}** puntos que mantienen **{targets}** después del shrine, sin pasarse de la build final.'
+    },
+    'shrineplan_plan': {
+        'en': 'Plan {n} · {kept}/{spent} points kept',
+        'es': 'Plan {n} · {kept}/{spent} puntos conservados'
+    },
+    'shrineplan_none': {
+        'en': 'No allocation meets these targets within the budget.',
+        'es': 'Ninguna distribución cumple estos objetivos con ese presupuesto.'
+    },
     
     # Help Command
     'help_menu': {
@@ -336,11 +421,13 @@ TRANSLATIONS = {
     'help_analytics_value': {
         'en': (
             '`ehp` — Calculates Effective Health Points (Reply to Build Link)\n'
+            '`ehpcurve` — Plots EHP against enemy penetration (Reply to Build Link)\n'
             '`stats` — Displays Stat Evolution diagram for optimisation (Reply to Build Link)\n'
             '`validate` — Validates build against Deepleague rulebook (Reply to Build Link)\n'
         ),
         'es': (
             '`ehp` — Calcula los Puntos de Vida Efectivos (Responde a un Enlace de Build)\n'
+            '`ehpcurve` — Grafica el EHP frente a la penetración enemiga (Responde a un Enlace de Build)\n'
             '`stats` — Muestra diagrama de Evolución de Stats para optimización (Responde a un Enlace de Build)\n'
             '`validate` — Valida la build según el reglamento de Deepleague (Responde a un Enlace de Build)\n'
         )
@@ -350,11 +437,13 @@ TRANSLATIONS = {
             '`.language <en|es>` — Change bot language (Admin only)\n'
             '`.clopen setup` — Initialize help channel rotation (Admin only)\n'
             '`.clopen status` — View clopen system status (Admin only)\n'
+            '`.cache [forget <build_link>]` — Show cache hit rates or drop a cached build (Admin only)\n'
         ),
         'es': (
             '`.language <en|es>` — Cambiar idioma del bot (Solo Admin)\n'
             '`.clopen setup` — Inicializar rotación de canales de ayuda (Solo Admin)\n'
             '`.clopen status` — Ver estado del sistema clopen (Solo Admin)\n'
+            '`.cache [forget <enlace_build>]` — Ver aciertos de caché o descartar una build en caché (Solo Admin)\n'
         )
     },
     'help_clopen_value': {